@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Plot Decimation
+
+Reduce long per-episode series to about as many points as a figure has
+pixel columns before handing them to matplotlib, so rendering time is
+bounded by the output size rather than the log length. Used by
+log_plotter.py and the compare-runs plotter; requires NumPy (installed
+with matplotlib).
+
+- lttb_indices(): Largest-Triangle-Three-Buckets, for lines. Keeps the
+  points that preserve the visual shape of a curve.
+- minmax_indices(): per-bucket minimum and maximum, for scatter plots. Keeps
+  every extreme a pixel column would show.
+- minmax_envelope(): the same buckets as a band to shade, standing in for
+  the solid area that overlapping markers paint.
+"""
+
+import numpy as np
+
+
+def lttb_indices(x, y, n_out: int) -> np.ndarray:
+    """Indices of n_out points of (x, y) chosen by Largest-Triangle-Three-Buckets.
+
+    The first and last points are always kept; each bucket in between
+    contributes the point forming the largest triangle with the previously
+    kept point and the mean of the next bucket.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    edges = (np.arange(n_out - 1) * ((n - 2) / (n_out - 2))).astype(np.int64) + 1
+    edges[-1] = n - 1
+    kept = np.empty(n_out, dtype=np.int64)
+    kept[0] = 0
+    kept[-1] = n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        areas = np.abs((x[a] - avg_x) * (y[start:end] - y[a])
+                       - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(areas.argmax())
+        kept[i + 1] = a
+    return kept
+
+
+def minmax_indices(y, n_buckets: int, x=None) -> np.ndarray:
+    """Sorted indices of the minimum and maximum of y in each of n_buckets buckets.
+
+    Buckets split the range of x (sorted) into equal widths, like pixel
+    columns; without x they hold equal numbers of points.
+    """
+    y = np.asarray(y)
+    n = len(y)
+    if n <= 2 * n_buckets:
+        return np.arange(n)
+
+    if x is None:
+        edges = np.linspace(0, n, n_buckets + 1).astype(np.int64)
+    else:
+        x = np.asarray(x)
+        edges = np.searchsorted(x, np.linspace(x[0], x[-1], n_buckets + 1))
+        edges[-1] = n
+    kept = []
+    for start, end in zip(edges[:-1], edges[1:]):
+        if end > start:
+            bucket = y[start:end]
+            kept.append(start + bucket.argmin())
+            kept.append(start + bucket.argmax())
+    return np.unique(kept)
+
+
+def minmax_envelope(x, y, n_buckets: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(x, low, high) of y's range in each of n_buckets equal-width x buckets (x sorted)."""
+    x = np.asarray(x)
+    y = np.asarray(y)
+    if len(x) == 0:
+        return x, y, y
+    edges = np.searchsorted(x, np.linspace(x[0], x[-1], n_buckets + 1))
+    edges = np.unique(edges[edges < len(x)])
+    centers = np.add.reduceat(x, edges) / np.diff(np.append(edges, len(x)))
+    return centers, np.minimum.reduceat(y, edges), np.maximum.reduceat(y, edges)
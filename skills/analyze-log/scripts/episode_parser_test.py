@@ -0,0 +1,48 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from episode_parser import legacy_parse_log_file, parse_episode_line, parse_log_chunks, parse_log_file
+
+
+LINES = [
+    "Run 1 ✓ LANDED_SOFTLY ✅ Landed Safely 🥕 Reward: 245.3 (env: 250.1 / shaped: -4.8)",
+    "Run 2 ✗ CRASHED_HIGH_VELOCITY ❌ Didn't land safely Reward: -50.0 env: -40.0 shaped: -10.0",
+    "Run 3 ✗ FLEW_OFF_LEFT Reward: 1.0 retried, Reward: 2.0",
+    "Run 4 ✓ LANDED_PERFECTLY env: 7.0 shaped: 3.0 Reward: 10.0",
+    "Run 5 ✓ LANDED_SOFTLY Reward: 10.0",
+    "  step 1500 | actor_loss 0.1234 | critic_loss 0.5678 | noise 0.100",
+    "12:00:01 Run 6 ✗ FLEW_OFF_LEFT Reward: -3.5 (env: -3.0 / shaped: -0.5)",
+]
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestEpisodeParser(unittest.TestCase):
+
+    def test_unparenthesised_env_and_shaped(self):
+        """Separate env: and shaped: values are picked up without the (env: / shaped:) form"""
+        episode = parse_episode_line(LINES[1])
+        self.assertEqual(episode.reward, -50.0)
+        self.assertEqual(episode.env_reward, -40.0)
+        self.assertEqual(episode.shaped_reward, -10.0)
+
+    def test_last_reward_wins(self):
+        """A line with several Reward: fields takes the last one, as the previous parser did"""
+        episode = parse_episode_line(LINES[2])
+        self.assertEqual(episode.reward, 2.0)
+        self.assertEqual(episode.env_reward, 2.0)
+        self.assertEqual(episode.shaped_reward, 0.0)
+
+    def test_matches_previous_parser(self):
+        """File parsers agree with the previous line-by-line parser on every line form"""
+        with tempfile.TemporaryDirectory() as tmp:
+            log = Path(tmp) / "train.log"
+            log.write_text("\n".join(LINES) + "\n", encoding="utf-8")
+            expected = legacy_parse_log_file(log)
+            self.assertEqual(len(expected), 6)
+            self.assertEqual(parse_log_file(log), expected)
+            self.assertEqual(parse_log_chunks(log, 1).episodes(), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Binary Episode Store
+
+Compact columnar export of a parsed training log, so tools can reload
+episodes without re-running the regex parser.
+
+A store file is a short JSON header followed by one fixed-width column per
+field: episode number (int32), success (uint8), outcome (uint16 code into
+the header's outcome names), and reward, env reward and shaped reward
+(float32, so values keep about 7 significant digits). Opening a store mmaps the file and exposes each column as a
+memoryview over the mapping, so loading is zero-copy and pages are read
+only when touched. With NumPy, ``numpy.frombuffer(store.rewards)`` wraps a
+column without copying.
+
+log_analyzer.py writes stores with --store, and log_analyzer.py,
+log_plotter.py and the compare-runs scripts accept a store anywhere they
+accept a log file.
+
+Usage:
+    python episode_store.py training_output.txt                 # writes training_output.txt.episodes
+    python episode_store.py training_output.txt --output run.episodes --jobs 8
+"""
+
+import argparse
+import json
+import mmap
+import struct
+import sys
+import time
+from array import array
+from pathlib import Path
+
+from episode_parser import Episode, EpisodeColumns, ParsedChunk, parse_log_chunks, summarize_chunk
+
+
+MAGIC = b"EPSTORE1"
+
+# Default suffix for stores written next to their log
+STORE_SUFFIX = ".episodes"
+
+# (name, array typecode) in file order; floats are stored single precision
+COLUMNS = [
+    ("numbers", "i"),
+    ("successes", "B"),
+    ("outcome_codes", "H"),
+    ("rewards", "f"),
+    ("env_rewards", "f"),
+    ("shaped_rewards", "f"),
+]
+
+# Columns start on multiples of this many bytes
+ALIGNMENT = 8
+
+
+def is_store(filepath: Path) -> bool:
+    """Whether a file is an episode store rather than a text log."""
+    with open(filepath, 'rb') as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def store_path_for(filepath: Path) -> Path:
+    """Default store path next to a log file."""
+    return filepath.with_name(filepath.name + STORE_SUFFIX)
+
+
+def write_store(chunk: ParsedChunk | EpisodeColumns, filepath: Path, source: str | None = None):
+    """Write a parsed chunk's (or EpisodeColumns') columns to a store file."""
+    columns = [array(typecode, getattr(chunk, name)) for name, typecode in COLUMNS]
+
+    header = {
+        "count": len(chunk),
+        "byteorder": sys.byteorder,
+        "source": source,
+        "outcomes": chunk.outcome_names,
+        "columns": [],
+    }
+    # Offsets are relative to the data section, which starts aligned after the header
+    position = 0
+    for (name, typecode), column in zip(COLUMNS, columns):
+        header["columns"].append({"name": name, "type": typecode, "offset": position})
+        position = _align(position + len(column) * column.itemsize)
+    encoded = json.dumps(header).encode()
+
+    with open(filepath, 'wb') as f:
+        f.write(MAGIC + struct.pack("<I", len(encoded)) + encoded)
+        data_start = _align(f.tell())
+        for spec, column in zip(header["columns"], columns):
+            f.write(b"\0" * (data_start + spec["offset"] - f.tell()))
+            column.tofile(f)
+
+
+def _align(n: int) -> int:
+    return -(-n // ALIGNMENT) * ALIGNMENT
+
+
+class EpisodeStore:
+    """A memory-mapped episode store.
+
+    Columns are memoryviews over the mapping, named as in ParsedChunk.
+    """
+
+    def __init__(self, filepath: Path):
+        self.filepath = Path(filepath)
+        with open(self.filepath, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{filepath} is not an episode store")
+            (header_len,) = struct.unpack("<I", f.read(4))
+            header = json.loads(f.read(header_len))
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if header["byteorder"] != sys.byteorder:
+            raise ValueError(f"{filepath} was written on a {header['byteorder']}-endian machine")
+
+        self.source = header["source"]
+        self.outcome_names = header["outcomes"]
+        count = header["count"]
+        data_start = _align(len(MAGIC) + 4 + header_len)
+        view = memoryview(self._mm)
+        for spec in header["columns"]:
+            itemsize = array(spec["type"]).itemsize
+            start = data_start + spec["offset"]
+            setattr(self, spec["name"], view[start:start + count * itemsize].cast(spec["type"]))
+
+    def __len__(self) -> int:
+        return len(self.numbers)
+
+    def columns(self) -> EpisodeColumns:
+        """The store's episodes as EpisodeColumns over the mapped file."""
+        return EpisodeColumns(self.numbers, self.successes, self.outcome_codes, self.outcome_names,
+                              self.rewards, self.env_rewards, self.shaped_rewards)
+
+    def chunk(self) -> ParsedChunk:
+        """The store as a ParsedChunk whose columns are views into the file."""
+        chunk = ParsedChunk(
+            **{name: getattr(self, name) for name, _ in COLUMNS},
+            outcome_names=self.outcome_names,
+        )
+        return summarize_chunk(chunk)
+
+    def episodes(self) -> list[Episode]:
+        """The store's episodes as Episode objects."""
+        return self.columns().episodes()
+
+
+def ensure_store(filepath: Path, store_path: Path, jobs: int = 1) -> Path:
+    """Path of an episode store for filepath: filepath itself if it is one,
+    else store_path after parsing the log into it."""
+    if is_store(filepath):
+        return filepath
+    write_store(parse_log_chunks(filepath, jobs), store_path, str(filepath))
+    return store_path
+
+
+def load_columns(filepath: Path, jobs: int = 1) -> EpisodeColumns:
+    """Episodes from a store, or from a text log parsed in ``jobs`` processes."""
+    if is_store(filepath):
+        return EpisodeStore(filepath).columns()
+    return parse_log_chunks(filepath, jobs).columns()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert a training log to an episode store")
+    parser.add_argument("logfile", help="Path to training log file")
+    parser.add_argument("--output", "-o", help="Store path (default: <logfile>.episodes)")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="Parse the log in this many processes (0 = one per CPU)")
+    args = parser.parse_args()
+
+    filepath = Path(args.logfile)
+    if not filepath.exists():
+        print(f"Error: File not found: {filepath}")
+        return 1
+    output = Path(args.output) if args.output else store_path_for(filepath)
+
+    start = time.perf_counter()
+    chunk = parse_log_chunks(filepath, args.jobs or None)
+    parse_time = time.perf_counter() - start
+    write_store(chunk, output, str(filepath))
+
+    start = time.perf_counter()
+    store = EpisodeStore(output)
+    map_time = time.perf_counter() - start
+    start = time.perf_counter()
+    store.chunk()
+    scan_time = time.perf_counter() - start
+
+    log_mb = filepath.stat().st_size / 1e6
+    store_mb = output.stat().st_size / 1e6
+    print(f"{len(store):,} episodes: {log_mb:.1f} MB log -> {store_mb:.1f} MB store ({output})")
+    print(f"  parse log:        {parse_time:8.3f}s")
+    print(f"  open store:       {map_time:8.3f}s")
+    print(f"  aggregate store:  {scan_time:8.3f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Learning Curve Engine
+
+Windowed success rate, mean reward and reward std over a run's episodes,
+shared by log_analyzer.py and the plotting scripts.
+
+Window sums come from prefix sums, so each window costs O(1) regardless of
+its size and a whole curve is O(episodes + windows): overlapping windows
+(stride < window), non-overlapping ones (stride = window, the default) and
+window size 1 all cost the same. Exponentially weighted curves use a
+blocked recurrence that NumPy evaluates with cumulative sums. NumPy is
+optional; without it, and for runs too short to repay importing it, the
+same algorithms run in pure Python.
+
+Usage:
+    python learning_curve.py training_output.txt --window 1            # time a curve
+    python learning_curve.py training_output.txt --window 100 --stride 10
+    python learning_curve.py training_output.txt --ewma 50
+"""
+
+import argparse
+import importlib.util
+import math
+import time
+from itertools import accumulate
+from pathlib import Path
+
+from episode_parser import parse_log_chunks
+from episode_store import EpisodeStore, is_store
+
+# NumPy is imported on first use: importing it takes longer than the
+# pure-Python curves do below NUMPY_MIN_EPISODES episodes
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+NUMPY_MIN_EPISODES = 200_000
+
+
+def window_count(n: int, window: int, stride: int) -> int:
+    """Number of windows starting at 0, stride, 2*stride, ... until one reaches the end.
+
+    Every window is full-length except possibly the last, which is cut short
+    at the end whenever (n - window) isn't a multiple of stride (or n < window).
+    With stride == window this tiles the episodes.
+    """
+    if n == 0:
+        return 0
+    return 1 + max(0, -(-(n - window) // stride))
+
+
+def rolling_curve(numbers, successes, rewards, window: int = 50, stride: int | None = None) -> list[dict]:
+    """Learning curve over windows of ``window`` episodes, one every ``stride`` episodes."""
+    stride = stride or window
+    n = len(rewards)
+    k = window_count(n, window, stride)
+    if k == 0:
+        return []
+
+    if HAS_NUMPY and n >= NUMPY_MIN_EPISODES:
+        import numpy as np
+        rewards = np.asarray(rewards, dtype=np.float64)
+        shift = float(rewards.mean())
+        # Centering keeps the sum-of-squares differences well conditioned
+        centered = rewards - shift
+        sums = np.concatenate(([0.0], np.cumsum(centered)))
+        squares = np.concatenate(([0.0], np.cumsum(centered * centered)))
+        wins = np.concatenate(([0], np.cumsum(np.asarray(successes, dtype=np.int64))))
+
+        starts = np.arange(k, dtype=np.int64) * stride
+        ends = np.minimum(starts + window, n)
+        counts = ends - starts
+        window_sums = sums[ends] - sums[starts]
+        means = window_sums / counts
+        deviations = squares[ends] - squares[starts] - window_sums * means
+        stds = np.sqrt(np.maximum(deviations, 0.0) / np.maximum(counts - 1, 1))
+        stds[counts == 1] = 0.0
+        return _points(np.asarray(numbers)[starts].tolist(), np.asarray(numbers)[ends - 1].tolist(),
+                       ((wins[ends] - wins[starts]) / counts).tolist(),
+                       (means + shift).tolist(), stds.tolist())
+
+    shift = math.fsum(rewards) / n
+    centered = [r - shift for r in rewards]
+    sums = list(accumulate(centered, initial=0.0))
+    squares = list(accumulate((c * c for c in centered), initial=0.0))
+    wins = list(accumulate(successes, initial=0))
+
+    first, last, rates, means, stds = [], [], [], [], []
+    for start in range(0, k * stride, stride):
+        end = min(start + window, n)
+        count = end - start
+        window_sum = sums[end] - sums[start]
+        mean = window_sum / count
+        deviation = squares[end] - squares[start] - window_sum * mean
+        first.append(numbers[start])
+        last.append(numbers[end - 1])
+        rates.append((wins[end] - wins[start]) / count)
+        means.append(mean + shift)
+        stds.append(math.sqrt(max(deviation, 0.0) / (count - 1)) if count > 1 else 0.0)
+    return _points(first, last, rates, means, stds)
+
+
+def ewma_curve(numbers, successes, rewards, span: int = 50, stride: int | None = None) -> list[dict]:
+    """Exponentially weighted learning curve, sampled every ``stride`` episodes.
+
+    Weights decay with alpha = 2 / (span + 1), starting from the first
+    episode. std is the exponentially weighted standard deviation under the
+    same weights. Each point's start_episode is ``span`` episodes back, as a
+    nominal window.
+    """
+    stride = stride or span
+    n = len(rewards)
+    if n == 0:
+        return []
+    alpha = 2 / (span + 1)
+
+    if HAS_NUMPY and n >= NUMPY_MIN_EPISODES:
+        import numpy as np
+        rewards = np.asarray(rewards, dtype=np.float64)
+        centered = rewards - rewards.mean()
+        means = _ewma_numpy(centered, alpha)
+        variances = np.maximum(_ewma_numpy(centered * centered, alpha) - means * means, 0.0)
+        rates = _ewma_numpy(np.asarray(successes, dtype=np.float64), alpha)
+        means += rewards.mean()
+        stds = np.sqrt(variances)
+        at = np.arange(stride - 1, n, stride)
+        if at.size == 0 or at[-1] != n - 1:
+            at = np.append(at, n - 1)
+        numbers = np.asarray(numbers)
+        return _points(numbers[np.maximum(at - span + 1, 0)].tolist(), numbers[at].tolist(),
+                       rates[at].tolist(), means[at].tolist(), stds[at].tolist())
+
+    shift = math.fsum(rewards) / n
+    mean = rewards[0] - shift
+    square = mean * mean
+    rate = float(successes[0])
+    first, last, rates, means, stds = [], [], [], [], []
+    for i in range(n):
+        x = rewards[i] - shift
+        mean += alpha * (x - mean)
+        square += alpha * (x * x - square)
+        rate += alpha * (successes[i] - rate)
+        if (i + 1) % stride == 0 or i == n - 1:
+            first.append(numbers[max(i - span + 1, 0)])
+            last.append(numbers[i])
+            rates.append(rate)
+            means.append(mean + shift)
+            stds.append(math.sqrt(max(square - mean * mean, 0.0)))
+    return _points(first, last, rates, means, stds)
+
+
+def _ewma_numpy(x, alpha: float):
+    """y[i] = (1 - alpha) * y[i-1] + alpha * x[i], with y[-1] = x[0], in blocks.
+
+    Inside a block the recurrence unrolls to a cumulative sum of
+    x[j] * beta**-j; blocks are short enough that beta**-j can't overflow.
+    """
+    import numpy as np
+    beta = 1 - alpha
+    block = max(1, int(600 / -math.log(beta))) if beta > 0 else 1
+    y = np.empty_like(x)
+    previous = x[0]
+    for start in range(0, len(x), block):
+        segment = x[start:start + block]
+        j = np.arange(len(segment))
+        decay = beta ** j
+        y[start:start + len(segment)] = (beta * decay * previous
+                                         + alpha * decay * np.cumsum(segment / decay))
+        previous = y[start + len(segment) - 1]
+    return y
+
+
+def _points(first, last, rates, means, stds) -> list[dict]:
+    return [
+        {"start_episode": s, "end_episode": e, "success_rate": rate,
+         "mean_reward": mean, "std_reward": std}
+        for s, e, rate, mean, std in zip(first, last, rates, means, stds)
+    ]
+
+
+def rolling_mean(values, window: int):
+    """Mean of each full window of ``window`` consecutive values (len(values) - window + 1 of them)."""
+    n = len(values)
+    if HAS_NUMPY:
+        import numpy as np
+        if n < window:
+            return np.empty(0)
+        values = np.asarray(values, dtype=np.float64)
+        sums = np.cumsum(values - values[0])
+        sums = np.concatenate(([0.0], sums))
+        return (sums[window:] - sums[:-window]) / window + values[0]
+    if n < window:
+        return []
+    sums = list(accumulate(values, initial=0.0))
+    return [(sums[i + window] - sums[i]) / window for i in range(n - window + 1)]
+
+
+def learning_curve(numbers, successes, rewards, window: int = 50, stride: int | None = None,
+                   ewma_span: int | None = None) -> list[dict]:
+    """Rolling-window curve, or an exponentially weighted one if ewma_span is set."""
+    if ewma_span:
+        return ewma_curve(numbers, successes, rewards, ewma_span, stride)
+    return rolling_curve(numbers, successes, rewards, window, stride)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time learning-curve computation on a log")
+    parser.add_argument("logfile", help="Path to training log file or episode store")
+    parser.add_argument("--window", type=int, default=50, help="Window size")
+    parser.add_argument("--stride", type=int, help="Episodes between windows (default: window size)")
+    parser.add_argument("--ewma", type=int, metavar="SPAN", help="Exponentially weighted curve with this span")
+    args = parser.parse_args()
+
+    filepath = Path(args.logfile)
+    if not filepath.exists():
+        print(f"Error: File not found: {filepath}")
+        return 1
+
+    chunk = EpisodeStore(filepath).chunk() if is_store(filepath) else parse_log_chunks(filepath, 1)
+    start = time.perf_counter()
+    curve = learning_curve(chunk.numbers, chunk.successes, chunk.rewards,
+                           args.window, args.stride, args.ewma)
+    elapsed = time.perf_counter() - start
+    print(f"{len(chunk):,} episodes -> {len(curve):,} curve points in {elapsed:.3f}s "
+          f"({'NumPy' if HAS_NUMPY and len(chunk) >= NUMPY_MIN_EPISODES else 'pure Python'})")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -8,34 +8,39 @@ Usage:
     python log_analyzer.py training_output.txt
     python log_analyzer.py training_output.txt --csv results.csv
     python log_analyzer.py training_output.txt --json
+    python log_analyzer.py training_output.txt --window 100 --stride 10
+    python log_analyzer.py huge_training_output.txt --stream
+    python log_analyzer.py huge_training_output.txt --jobs 8
+    python log_analyzer.py live_training_output.txt --follow
+    python log_analyzer.py training_output.txt --store run.episodes
+    python log_analyzer.py run.episodes
 """
 
 import argparse
-import re
+import bisect
 import json
 import csv
+import math
+import os
 import statistics
+import sys
+import time
 from pathlib import Path
 from dataclasses import dataclass, field
 from collections import Counter
+from collections.abc import Sequence
 
-
-@dataclass
-class Episode:
-    """Single episode result."""
-    number: int
-    success: bool
-    outcome: str
-    reward: float
-    env_reward: float = 0.0
-    shaped_reward: float = 0.0
+from episode_parser import (Episode, ParsedChunk, iter_episodes, last_line_end, parse_episode_line,
+                            parse_log_chunks, parse_log_file)
+from episode_store import EpisodeStore, is_store, write_store
+from learning_curve import learning_curve
 
 
 @dataclass
 class LogAnalysis:
     """Complete log analysis results."""
     file: str
-    episodes: list[Episode] = field(default_factory=list)
+    episodes: Sequence[Episode] = field(default_factory=list)
     total_episodes: int = 0
     successes: int = 0
     failures: int = 0
@@ -47,110 +52,362 @@ class LogAnalysis:
     first_success_episode: int = -1
     outcome_distribution: dict = field(default_factory=dict)
     learning_curve: list[dict] = field(default_factory=list)
-
-
-def parse_episode_line(line: str) -> Episode | None:
-    """Parse a single episode result line."""
-    # Pattern: Run 123 ✓ OUTCOME ... Reward: 245.3 (env: 250.1 / shaped: -4.8)
-    pattern = r"Run (\d+)\s*([✓✗])\s*(\w+).*Reward:\s*([\d.-]+)"
-    match = re.search(pattern, line)
-
-    if not match:
-        return None
-
-    episode_num = int(match.group(1))
-    success = match.group(2) == "✓"
-    outcome = match.group(3)
-    reward = float(match.group(4))
-
-    # Try to extract env and shaped rewards
-    env_match = re.search(r"env:\s*([\d.-]+)", line)
-    shaped_match = re.search(r"shaped:\s*([\d.-]+)", line)
-
-    env_reward = float(env_match.group(1)) if env_match else reward
-    shaped_reward = float(shaped_match.group(1)) if shaped_match else 0.0
-
-    return Episode(
-        number=episode_num,
-        success=success,
-        outcome=outcome,
-        reward=reward,
-        env_reward=env_reward,
-        shaped_reward=shaped_reward
-    )
-
-
-def parse_log_file(filepath: Path) -> list[Episode]:
-    """Parse all episodes from a log file."""
-    episodes = []
-
-    with open(filepath, encoding='utf-8', errors='ignore') as f:
-        for line in f:
-            episode = parse_episode_line(line)
-            if episode:
-                episodes.append(episode)
-
-    return episodes
-
-
-def compute_learning_curve(episodes: list[Episode], window_size: int = 50) -> list[dict]:
-    """Compute learning curve with rolling windows."""
-    curve = []
-
-    for i in range(0, len(episodes), window_size):
-        window = episodes[i:i + window_size]
-        if not window:
-            continue
-
-        successes = sum(1 for e in window if e.success)
-        rewards = [e.reward for e in window]
-
-        curve.append({
-            "start_episode": window[0].number,
-            "end_episode": window[-1].number,
-            "success_rate": successes / len(window),
-            "mean_reward": statistics.mean(rewards),
-            "std_reward": statistics.stdev(rewards) if len(rewards) > 1 else 0
-        })
-
-    return curve
-
-
-def analyze_log(filepath: Path) -> LogAnalysis:
+    reward_quantiles: dict = field(default_factory=dict)
+
+
+# Reward percentiles reported alongside mean/min/max
+QUANTILES = {"p10": 0.1, "median": 0.5, "p90": 0.9}
+
+# Most learning-curve windows printed in the text report (evenly sampled beyond this)
+CURVE_ROWS = 50
+
+# Sidecar written next to a log by --incremental / --follow
+CHECKPOINT_SUFFIX = ".checkpoint.json"
+
+# Leading bytes stored in a checkpoint to tell a rewritten log from the original
+CHECKPOINT_HEAD_BYTES = 256
+
+
+class RunningStats:
+    """Count, mean, sample std, min and max of a stream (Welford's algorithm)."""
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, x: float):
+        self.n += 1
+        delta = x - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (x - self.mean)
+        self.min = min(self.min, x)
+        self.max = max(self.max, x)
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.m2 / (self.n - 1)) if self.n > 1 else 0
+
+
+class P2Quantile:
+    """Streaming estimate of one quantile in constant memory.
+
+    Jain & Chlamtac's P-square algorithm: five markers track the minimum,
+    the p/2, p and (1+p)/2 quantiles and the maximum, and are nudged towards
+    their ideal positions with a piecewise-parabolic fit as values arrive.
+    Exact until the sixth value.
+    """
+
+    def __init__(self, p: float):
+        self.p = p
+        self.heights = []
+        self.positions = [1, 2, 3, 4, 5]
+        self.desired = [1, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5]
+        self.increments = [0, p / 2, p, (1 + p) / 2, 1]
+
+    def add(self, x: float):
+        q, n = self.heights, self.positions
+        if len(q) < 5:
+            bisect.insort(q, x)
+            return
+
+        # Cell k holds x (q[k] <= x < q[k+1]); extremes move the end markers
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = bisect.bisect_right(q, x) - 1
+
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+
+        for i in (1, 2, 3):
+            d = self.desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                height = q[i] + d / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                    + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1]))
+                if not q[i - 1] < height < q[i + 1]:
+                    # Parabola overshoots a neighbour; fall back to linear
+                    height = q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+                q[i] = height
+                n[i] += d
+
+    @property
+    def value(self) -> float:
+        q = self.heights
+        if len(q) == 5:
+            return q[2]
+        if not q:
+            return 0.0
+        return q[round(self.p * (len(q) - 1))]
+
+
+def compute_learning_curve(episodes: list[Episode], window_size: int = 50, stride: int | None = None,
+                           ewma_span: int | None = None) -> list[dict]:
+    """Compute learning curve with rolling (or exponentially weighted) windows."""
+    return learning_curve([e.number for e in episodes], [e.success for e in episodes],
+                          [e.reward for e in episodes], window_size, stride, ewma_span)
+
+
+def reward_quantiles(rewards: Sequence[float]) -> dict:
+    """Exact reward percentiles (QUANTILES)."""
+    if len(rewards) < 2:
+        return {name: rewards[0] for name in QUANTILES} if rewards else {}
+    cuts = statistics.quantiles(rewards, n=100, method="inclusive")
+    return {name: cuts[round(p * 100) - 1] for name, p in QUANTILES.items()}
+
+
+def analyze_log(filepath: Path, window_size: int = 50, stride: int | None = None,
+                ewma_span: int | None = None) -> LogAnalysis:
     """Perform complete analysis of a log file."""
-    episodes = parse_log_file(filepath)
-
-    if not episodes:
-        return LogAnalysis(file=str(filepath))
+    return analysis_from_chunk(parse_log_chunks(filepath, 1), str(filepath),
+                               window_size, keep_episodes=True, stride=stride, ewma_span=ewma_span)
+
+
+def analyze_log_parallel(filepath: Path, window_size: int = 50, jobs: int | None = None,
+                         keep_episodes: bool = False, stride: int | None = None,
+                         ewma_span: int | None = None) -> LogAnalysis:
+    """Analyze a log parsed in chunks by a pool of worker processes.
+
+    Workers return per-chunk aggregates that are merged without revisiting
+    episodes; the learning curve and percentiles use the merged columns,
+    which keep file order. The columns are only kept as ``episodes`` if
+    ``keep_episodes`` is set (for --csv).
+    """
+    return analysis_from_chunk(parse_log_chunks(filepath, jobs), str(filepath),
+                               window_size, keep_episodes, stride, ewma_span)
+
+
+def analyze_store(filepath: Path, window_size: int = 50, keep_episodes: bool = False,
+                  stride: int | None = None, ewma_span: int | None = None) -> LogAnalysis:
+    """Analyze an episode store written with --store, reading its mmapped columns."""
+    return analysis_from_chunk(EpisodeStore(filepath).chunk(), str(filepath),
+                               window_size, keep_episodes, stride, ewma_span)
+
+
+def analysis_from_chunk(chunk: ParsedChunk, file: str, window_size: int = 50,
+                        keep_episodes: bool = False, stride: int | None = None,
+                        ewma_span: int | None = None) -> LogAnalysis:
+    """LogAnalysis from a chunk's columns and aggregates."""
+    n = len(chunk)
+    if n == 0:
+        return LogAnalysis(file=file)
+
+    return LogAnalysis(
+        file=file,
+        episodes=chunk.columns() if keep_episodes else [],
+        total_episodes=n,
+        successes=chunk.n_successes,
+        failures=n - chunk.n_successes,
+        success_rate=chunk.n_successes / n,
+        mean_reward=chunk.reward_mean,
+        std_reward=math.sqrt(chunk.reward_m2 / (n - 1)) if n > 1 else 0,
+        max_reward=chunk.reward_max,
+        min_reward=chunk.reward_min,
+        first_success_episode=chunk.first_success,
+        outcome_distribution=dict(Counter(chunk.outcome_counts).most_common()),
+        learning_curve=learning_curve(chunk.numbers, chunk.successes, chunk.rewards,
+                                      window_size, stride, ewma_span),
+        reward_quantiles=reward_quantiles(chunk.rewards.tolist())
+    )
 
-    rewards = [e.reward for e in episodes]
-    successes = [e for e in episodes if e.success]
-    outcomes = Counter(e.outcome for e in episodes)
 
-    # Find first success
-    first_success = -1
-    for e in episodes:
+class StreamingAnalysis:
+    """Online accumulators behind --stream and --incremental.
+
+    Memory is O(learning-curve windows + distinct outcomes): rewards feed
+    Welford and P-square accumulators, and each learning-curve window is
+    closed as soon as it fills. The whole state round-trips through JSON,
+    so an analysis can be checkpointed and resumed on more of the log.
+    """
+
+    def __init__(self, window_size: int = 50):
+        self.window_size = window_size
+        self.rewards = RunningStats()
+        self.quantiles = {name: P2Quantile(p) for name, p in QUANTILES.items()}
+        self.outcomes = Counter()
+        self.successes = 0
+        self.first_success = -1
+        self.curve = []
+        self.window = RunningStats()
+        self.window_successes = 0
+        self.window_start = 0
+        self.window_end = 0
+
+    def add(self, e: Episode):
+        self.rewards.add(e.reward)
+        for quantile in self.quantiles.values():
+            quantile.add(e.reward)
+        self.outcomes[e.outcome] += 1
         if e.success:
-            first_success = e.number
-            break
-
-    analysis = LogAnalysis(
-        file=str(filepath),
-        episodes=episodes,
-        total_episodes=len(episodes),
-        successes=len(successes),
-        failures=len(episodes) - len(successes),
-        success_rate=len(successes) / len(episodes) if episodes else 0,
-        mean_reward=statistics.mean(rewards),
-        std_reward=statistics.stdev(rewards) if len(rewards) > 1 else 0,
-        max_reward=max(rewards),
-        min_reward=min(rewards),
-        first_success_episode=first_success,
-        outcome_distribution=dict(outcomes.most_common()),
-        learning_curve=compute_learning_curve(episodes)
-    )
+            self.successes += 1
+            if self.first_success == -1:
+                self.first_success = e.number
+
+        if self.window.n == 0:
+            self.window_start = e.number
+        self.window.add(e.reward)
+        self.window_successes += e.success
+        self.window_end = e.number
+        if self.window.n == self.window_size:
+            self.curve.append(self._window_point())
+            self.window = RunningStats()
+            self.window_successes = 0
+
+    def _window_point(self) -> dict:
+        return {
+            "start_episode": self.window_start,
+            "end_episode": self.window_end,
+            "success_rate": self.window_successes / self.window.n,
+            "mean_reward": self.window.mean,
+            "std_reward": self.window.std
+        }
+
+    def result(self, file: str) -> LogAnalysis:
+        """The analysis so far; a partly filled window is the last curve point."""
+        if self.rewards.n == 0:
+            return LogAnalysis(file=file)
+
+        curve = self.curve + [self._window_point()] if self.window.n else list(self.curve)
+        return LogAnalysis(
+            file=file,
+            total_episodes=self.rewards.n,
+            successes=self.successes,
+            failures=self.rewards.n - self.successes,
+            success_rate=self.successes / self.rewards.n,
+            mean_reward=self.rewards.mean,
+            std_reward=self.rewards.std,
+            max_reward=self.rewards.max,
+            min_reward=self.rewards.min,
+            first_success_episode=self.first_success,
+            outcome_distribution=dict(self.outcomes.most_common()),
+            learning_curve=curve,
+            reward_quantiles={name: quantile.value for name, quantile in self.quantiles.items()}
+        )
+
+    def state(self) -> dict:
+        """JSON-serialisable accumulator state."""
+        return {
+            "window_size": self.window_size,
+            "rewards": vars(self.rewards),
+            "quantiles": {name: vars(quantile) for name, quantile in self.quantiles.items()},
+            "outcomes": dict(self.outcomes),
+            "successes": self.successes,
+            "first_success": self.first_success,
+            "curve": self.curve,
+            "window": vars(self.window),
+            "window_successes": self.window_successes,
+            "window_start": self.window_start,
+            "window_end": self.window_end,
+        }
 
-    return analysis
+    @classmethod
+    def from_state(cls, state: dict) -> "StreamingAnalysis":
+        analysis = cls(state["window_size"])
+        vars(analysis.rewards).update(state["rewards"])
+        for name, quantile_state in state["quantiles"].items():
+            vars(analysis.quantiles[name]).update(quantile_state)
+        analysis.outcomes = Counter(state["outcomes"])
+        analysis.successes = state["successes"]
+        analysis.first_success = state["first_success"]
+        analysis.curve = state["curve"]
+        vars(analysis.window).update(state["window"])
+        analysis.window_successes = state["window_successes"]
+        analysis.window_start = state["window_start"]
+        analysis.window_end = state["window_end"]
+        return analysis
+
+
+def analyze_log_stream(filepath: Path, window_size: int = 50, csv_path: Path | None = None) -> LogAnalysis:
+    """Analyze a log file in one pass without keeping its episodes.
+
+    Percentiles are estimates; everything else matches analyze_log(). The
+    returned analysis has no ``episodes``, so rows for --csv are written
+    while streaming instead.
+    """
+    analysis = StreamingAnalysis(window_size)
+
+    csv_file = open(csv_path, 'w', newline='') if csv_path else None
+    try:
+        if csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(['episode', 'success', 'outcome', 'reward', 'env_reward', 'shaped_reward'])
+
+        for e in iter_episodes(filepath):
+            if csv_file:
+                writer.writerow([e.number, e.success, e.outcome, e.reward, e.env_reward, e.shaped_reward])
+            analysis.add(e)
+    finally:
+        if csv_file:
+            csv_file.close()
+
+    return analysis.result(str(filepath))
+
+
+def checkpoint_path_for(filepath: Path) -> Path:
+    """Default sidecar checkpoint next to a log file."""
+    return filepath.with_name(filepath.name + CHECKPOINT_SUFFIX)
+
+
+def analyze_log_incremental(filepath: Path, window_size: int = 50,
+                            checkpoint_path: Path | None = None) -> tuple[LogAnalysis, int]:
+    """Analyze only what was appended to a log since the last call.
+
+    The byte offset reached and the StreamingAnalysis state are kept in a
+    sidecar checkpoint. A checkpoint for a different file (inode or first
+    bytes changed, or the log shrank) or window size is discarded and the
+    log is read from the start. A trailing line without its newline is
+    left for the next call. Returns the analysis and the bytes parsed.
+    """
+    checkpoint_path = checkpoint_path or checkpoint_path_for(filepath)
+    stat = os.stat(filepath)
+
+    analysis = StreamingAnalysis(window_size)
+    offset = 0
+    try:
+        with open(checkpoint_path) as f:
+            checkpoint = json.load(f)
+        if (checkpoint["inode"] == stat.st_ino
+                and checkpoint["offset"] <= stat.st_size
+                and checkpoint["state"]["window_size"] == window_size
+                and file_head(filepath, len(checkpoint["head"]) // 2) == checkpoint["head"]):
+            analysis = StreamingAnalysis.from_state(checkpoint["state"])
+            offset = checkpoint["offset"]
+    except (OSError, json.JSONDecodeError, KeyError, TypeError):
+        pass
+
+    end = last_line_end(filepath, offset)
+    for e in iter_episodes(filepath, offset, end):
+        analysis.add(e)
+
+    checkpoint = {
+        "file": str(filepath),
+        "inode": stat.st_ino,
+        "offset": end,
+        "head": file_head(filepath, min(end, CHECKPOINT_HEAD_BYTES)),
+        "state": analysis.state(),
+    }
+    tmp_path = checkpoint_path.with_name(f".{checkpoint_path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(checkpoint, f)
+    os.replace(tmp_path, checkpoint_path)
+
+    return analysis.result(str(filepath)), end - offset
+
+
+def file_head(filepath: Path, n_bytes: int) -> str:
+    """First n_bytes of a file as hex, to recognise it across calls."""
+    with open(filepath, 'rb') as f:
+        return f.read(n_bytes).hex()
 
 
 def format_analysis(analysis: LogAnalysis) -> str:
@@ -181,6 +438,9 @@ def format_analysis(analysis: LogAnalysis) -> str:
     output.append(f"Mean Reward: {analysis.mean_reward:.1f} (std: {analysis.std_reward:.1f})")
     output.append(f"Max Reward: {analysis.max_reward:.1f}")
     output.append(f"Min Reward: {analysis.min_reward:.1f}")
+    if analysis.reward_quantiles:
+        output.append("Percentiles: " + ", ".join(
+            f"{name} {value:.1f}" for name, value in analysis.reward_quantiles.items()))
 
     # Outcome distribution
     output.append(f"\n{'='*60}")
@@ -196,7 +456,12 @@ def format_analysis(analysis: LogAnalysis) -> str:
         output.append(f"\n{'='*60}")
         output.append("LEARNING CURVE")
         output.append(f"{'='*60}")
-        for window in analysis.learning_curve:
+        curve = analysis.learning_curve
+        if len(curve) > CURVE_ROWS:
+            step = (len(curve) - 1) / (CURVE_ROWS - 1)
+            curve = [curve[round(i * step)] for i in range(CURVE_ROWS)]
+            output.append(f"  ({CURVE_ROWS} of {len(analysis.learning_curve)} windows shown; --json lists all)")
+        for window in curve:
             success_bar = "#" * int(window['success_rate'] * 40)
             output.append(
                 f"  Episodes {window['start_episode']:>4}-{window['end_episode']:<4}: "
@@ -256,6 +521,22 @@ def main():
     parser.add_argument("--csv", help="Export to CSV file")
     parser.add_argument("--json", action="store_true", help="Output as JSON")
     parser.add_argument("--window", type=int, default=50, help="Learning curve window size")
+    parser.add_argument("--stride", type=int,
+                        help="Episodes between learning curve windows (default: window size; smaller overlaps them)")
+    parser.add_argument("--ewma", type=int, metavar="SPAN",
+                        help="Exponentially weighted learning curve with this span instead of windows")
+    parser.add_argument("--stream", action="store_true",
+                        help="Single pass in constant memory (approximate percentiles)")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="Parse the log in this many processes (0 = one per CPU)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Parse only bytes appended since the last run (state kept in a sidecar file)")
+    parser.add_argument("--follow", action="store_true",
+                        help="Keep re-analyzing a growing log incrementally")
+    parser.add_argument("--interval", type=float, default=10.0,
+                        help="Seconds between checks in --follow mode")
+    parser.add_argument("--checkpoint", help="Sidecar checkpoint path (default: <logfile>.checkpoint.json)")
+    parser.add_argument("--store", help="Export episodes to a binary episode store")
     args = parser.parse_args()
 
     filepath = Path(args.logfile)
@@ -263,7 +544,60 @@ def main():
         print(f"Error: File not found: {filepath}")
         return 1
 
-    analysis = analyze_log(filepath)
+    from_store = is_store(filepath)
+    if from_store and (args.incremental or args.follow or args.store):
+        print("Error: --incremental, --follow and --store need a text log, not an episode store")
+        return 1
+    if (args.stride or args.ewma) and (args.stream or args.incremental or args.follow):
+        print("Error: --stride and --ewma can't be combined with --stream, --incremental or --follow")
+        return 1
+    if args.window < 1 or (args.stride is not None and args.stride < 1) or (args.ewma is not None and args.ewma < 1):
+        print("Error: --window, --stride and --ewma must be positive")
+        return 1
+    if args.store and (args.stream or args.incremental or args.follow):
+        print("Error: --store can't be combined with --stream, --incremental or --follow")
+        return 1
+    if args.csv and (args.incremental or args.follow):
+        print("Error: --csv needs the full log, not --incremental or --follow")
+        return 1
+
+    checkpoint_path = Path(args.checkpoint) if args.checkpoint else None
+    if args.follow:
+        try:
+            first = True
+            while True:
+                analysis, new_bytes = analyze_log_incremental(filepath, args.window, checkpoint_path)
+                if new_bytes or first:
+                    if sys.stdout.isatty():
+                        print("\033[H\033[J", end="")
+                    print(format_analysis(analysis))
+                    print(f"\n(+{new_bytes} bytes parsed at {time.strftime('%H:%M:%S')}; "
+                          f"checking every {args.interval:.0f}s, Ctrl-C to stop)")
+                    sys.stdout.flush()
+                    first = False
+                time.sleep(args.interval)
+        except KeyboardInterrupt:
+            return 0
+
+    if from_store:
+        analysis = analyze_store(filepath, args.window, keep_episodes=bool(args.csv),
+                                 stride=args.stride, ewma_span=args.ewma)
+    elif args.incremental:
+        analysis, _ = analyze_log_incremental(filepath, args.window, checkpoint_path)
+    elif args.stream:
+        analysis = analyze_log_stream(filepath, args.window, Path(args.csv) if args.csv else None)
+    elif args.store:
+        # The columnar parse feeds both the analysis and the store
+        chunk = parse_log_chunks(filepath, args.jobs or None)
+        analysis = analysis_from_chunk(chunk, str(filepath), args.window, keep_episodes=bool(args.csv),
+                                       stride=args.stride, ewma_span=args.ewma)
+        write_store(chunk, Path(args.store), str(filepath))
+    elif args.jobs != 1:
+        analysis = analyze_log_parallel(filepath, args.window, args.jobs or None,
+                                        keep_episodes=bool(args.csv), stride=args.stride,
+                                        ewma_span=args.ewma)
+    else:
+        analysis = analyze_log(filepath, args.window, args.stride, args.ewma)
 
     if args.json:
         # Convert to JSON-serializable format
@@ -278,6 +612,7 @@ def main():
             "min_reward": analysis.min_reward,
             "first_success_episode": analysis.first_success_episode,
             "outcome_distribution": analysis.outcome_distribution,
+            "reward_quantiles": analysis.reward_quantiles,
             "learning_curve": analysis.learning_curve
         }
         print(json.dumps(data, indent=2))
@@ -285,9 +620,13 @@ def main():
         print(format_analysis(analysis))
 
     if args.csv:
-        export_csv(analysis, Path(args.csv))
+        if not args.stream:
+            export_csv(analysis, Path(args.csv))
         print(f"\nExported to: {args.csv}")
 
+    if args.store:
+        print(f"\nStored episodes in: {args.store}")
+
     return 0
 
 
@@ -7,68 +7,72 @@ Generate visualizations from training logs.
 Usage:
     python log_plotter.py training_output.txt
     python log_plotter.py training_output.txt --output charts/
+    python log_plotter.py run.episodes
+    python log_plotter.py huge_training_output.txt --jobs 4
 """
 
 import argparse
-import re
+import importlib.util
+from itertools import repeat
 from pathlib import Path
-from dataclasses import dataclass
 
-# Check for matplotlib
-try:
-    import matplotlib.pyplot as plt
-    import matplotlib
-    matplotlib.use('Agg')  # Non-interactive backend
-    HAS_MATPLOTLIB = True
-except ImportError:
-    HAS_MATPLOTLIB = False
+from episode_parser import EpisodeColumns
+from episode_store import EpisodeStore, ensure_store, load_columns
 
+# matplotlib (and NumPy, which it requires) is imported only when a figure
+# is drawn: it dominates startup time, and the ASCII output never needs it
+HAS_MATPLOTLIB = importlib.util.find_spec("matplotlib") is not None
 
-@dataclass
-class Episode:
-    number: int
-    success: bool
-    outcome: str
-    reward: float
 
+def pyplot():
+    """matplotlib.pyplot on the non-interactive Agg backend, imported on first use."""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    return plt
 
-def parse_log_file(filepath: Path) -> list[Episode]:
-    """Parse episodes from log file."""
-    episodes = []
-    pattern = r"Run (\d+)\s*([✓✗])\s*(\w+).*Reward:\s*([\d.-]+)"
 
-    with open(filepath, encoding='utf-8', errors='ignore') as f:
-        for line in f:
-            match = re.search(pattern, line)
-            if match:
-                episodes.append(Episode(
-                    number=int(match.group(1)),
-                    success=match.group(2) == "✓",
-                    outcome=match.group(3),
-                    reward=float(match.group(4))
-                ))
+DPI = 150
 
-    return episodes
 
+def pixel_columns(fig) -> int:
+    """Horizontal resolution of a saved figure: the most points worth plotting along x."""
+    return int(fig.get_figwidth() * DPI)
 
-def plot_rewards(episodes: list[Episode], output_path: Path):
-    """Plot reward over episodes."""
-    fig, ax = plt.subplots(figsize=(12, 6))
 
-    x = [e.number for e in episodes]
-    y = [e.reward for e in episodes]
+def plot_rewards(episodes: EpisodeColumns, output_path: Path):
+    """Plot reward over episodes."""
+    import numpy as np
+    from decimate import lttb_indices, minmax_envelope, minmax_indices
+    from learning_curve import rolling_mean
+    plt = pyplot()
 
-    # Plot individual rewards
-    colors = ['green' if e.success else 'red' for e in episodes]
-    ax.scatter(x, y, c=colors, alpha=0.5, s=10)
+    fig, ax = plt.subplots(figsize=(12, 6))
+    columns = pixel_columns(fig)
+
+    # Zero-copy arrays over the columns (matplotlib can't index memoryviews)
+    x = np.asarray(episodes.numbers)
+    y = np.asarray(episodes.rewards)
+    success = np.asarray(episodes.successes, dtype=bool)
+
+    # Plot individual rewards. On long logs each pixel column gets a band
+    # over its range per outcome plus markers at its extremes, which is what
+    # the full set of overlapping markers would show
+    for mask, color in ((success, 'green'), (~success, 'red')):
+        xs, ys = x[mask], y[mask]
+        if len(ys) > 2 * columns:
+            band_x, low, high = minmax_envelope(xs, ys, columns)
+            ax.fill_between(band_x, low, high, color=color, alpha=0.5, linewidth=0)
+        keep = minmax_indices(ys, columns, xs)
+        ax.scatter(xs[keep], ys[keep], c=color, alpha=0.5, s=10)
 
     # Plot rolling average
     window = 50
     if len(y) >= window:
-        rolling_avg = []
-        for i in range(len(y) - window + 1):
-            rolling_avg.append(sum(y[i:i+window]) / window)
-        ax.plot(x[window-1:], rolling_avg, 'b-', linewidth=2, label=f'{window}-episode rolling avg')
+        rolling_avg = rolling_mean(y, window)
+        rolling_x = x[window-1:]
+        keep = lttb_indices(rolling_x, rolling_avg, columns)
+        ax.plot(rolling_x[keep], rolling_avg[keep], 'b-', linewidth=2, label=f'{window}-episode rolling avg')
 
     ax.axhline(y=200, color='green', linestyle='--', alpha=0.5, label='Success threshold')
     ax.axhline(y=0, color='gray', linestyle='-', alpha=0.3)
@@ -80,24 +84,25 @@ def plot_rewards(episodes: list[Episode], output_path: Path):
     ax.grid(True, alpha=0.3)
 
     plt.tight_layout()
-    plt.savefig(output_path / 'rewards.png', dpi=150)
+    plt.savefig(output_path / 'rewards.png', dpi=DPI)
     plt.close()
     print(f"  Saved: {output_path / 'rewards.png'}")
 
 
-def plot_success_rate(episodes: list[Episode], output_path: Path):
+def plot_success_rate(episodes: EpisodeColumns, output_path: Path):
     """Plot success rate over time."""
+    import numpy as np
+    from decimate import lttb_indices
+    from learning_curve import rolling_mean
+    plt = pyplot()
+
     fig, ax = plt.subplots(figsize=(12, 6))
 
     window = 50
-    success_rates = []
-    x_values = []
-
-    for i in range(window, len(episodes) + 1):
-        window_episodes = episodes[i-window:i]
-        rate = sum(1 for e in window_episodes if e.success) / window
-        success_rates.append(rate * 100)
-        x_values.append(i)
+    success_rates = rolling_mean(episodes.successes, window) * 100
+    x_values = np.arange(window, len(episodes) + 1)
+    keep = lttb_indices(x_values, success_rates, pixel_columns(fig))
+    x_values, success_rates = x_values[keep], success_rates[keep]
 
     ax.plot(x_values, success_rates, 'b-', linewidth=2)
     ax.fill_between(x_values, success_rates, alpha=0.3)
@@ -113,16 +118,17 @@ def plot_success_rate(episodes: list[Episode], output_path: Path):
     ax.grid(True, alpha=0.3)
 
     plt.tight_layout()
-    plt.savefig(output_path / 'success_rate.png', dpi=150)
+    plt.savefig(output_path / 'success_rate.png', dpi=DPI)
     plt.close()
     print(f"  Saved: {output_path / 'success_rate.png'}")
 
 
-def plot_outcome_distribution(episodes: list[Episode], output_path: Path):
+def plot_outcome_distribution(episodes: EpisodeColumns, output_path: Path):
     """Plot outcome distribution as pie chart."""
     from collections import Counter
+    plt = pyplot()
 
-    outcomes = Counter(e.outcome for e in episodes)
+    outcomes = Counter(episodes.outcomes())
 
     fig, ax = plt.subplots(figsize=(10, 8))
 
@@ -154,16 +160,19 @@ def plot_outcome_distribution(episodes: list[Episode], output_path: Path):
     ax.set_title('Outcome Distribution')
 
     plt.tight_layout()
-    plt.savefig(output_path / 'outcomes.png', dpi=150)
+    plt.savefig(output_path / 'outcomes.png', dpi=DPI)
     plt.close()
     print(f"  Saved: {output_path / 'outcomes.png'}")
 
 
-def plot_reward_histogram(episodes: list[Episode], output_path: Path):
+def plot_reward_histogram(episodes: EpisodeColumns, output_path: Path):
     """Plot reward distribution histogram."""
+    import numpy as np
+    plt = pyplot()
+
     fig, ax = plt.subplots(figsize=(10, 6))
 
-    rewards = [e.reward for e in episodes]
+    rewards = np.asarray(episodes.rewards)
 
     ax.hist(rewards, bins=50, edgecolor='black', alpha=0.7)
     ax.axvline(x=200, color='green', linestyle='--', label='Success threshold')
@@ -176,17 +185,43 @@ def plot_reward_histogram(episodes: list[Episode], output_path: Path):
     ax.grid(True, alpha=0.3)
 
     plt.tight_layout()
-    plt.savefig(output_path / 'reward_histogram.png', dpi=150)
+    plt.savefig(output_path / 'reward_histogram.png', dpi=DPI)
     plt.close()
     print(f"  Saved: {output_path / 'reward_histogram.png'}")
 
 
-def generate_ascii_chart(episodes: list[Episode], width: int = 60) -> str:
+# Figures rendered by main(), each independent of the others
+FIGURES = {
+    "rewards": plot_rewards,
+    "success_rate": plot_success_rate,
+    "outcomes": plot_outcome_distribution,
+    "reward_histogram": plot_reward_histogram,
+}
+
+
+def render_from_store(figure: str, store_path: Path, output_path: Path):
+    """Render one figure from a memory-mapped episode store (run in a worker process)."""
+    FIGURES[figure](EpisodeStore(store_path).columns(), output_path)
+
+
+def render_parallel(store_path: Path, output_path: Path, jobs: int):
+    """Render all figures in up to ``jobs`` processes sharing one episode store.
+
+    Workers mmap the store, so the episodes are shared through the page
+    cache instead of being pickled to each process.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=min(jobs, len(FIGURES))) as pool:
+        list(pool.map(render_from_store, FIGURES, repeat(store_path), repeat(output_path)))
+
+
+def generate_ascii_chart(episodes: EpisodeColumns, width: int = 60) -> str:
     """Generate ASCII chart for environments without matplotlib."""
     if not episodes:
         return "No episodes to plot."
 
-    rewards = [e.reward for e in episodes]
+    rewards = episodes.rewards
     min_r, max_r = min(rewards), max(rewards)
     range_r = max_r - min_r if max_r != min_r else 1
 
@@ -214,9 +249,11 @@ def generate_ascii_chart(episodes: list[Episode], width: int = 60) -> str:
 
 def main():
     parser = argparse.ArgumentParser(description="Generate training log plots")
-    parser.add_argument("logfile", help="Path to training log file")
+    parser.add_argument("logfile", help="Path to training log file or episode store")
     parser.add_argument("--output", "-o", default=".", help="Output directory for plots")
     parser.add_argument("--ascii", action="store_true", help="Generate ASCII chart only")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="Parse the log and render figures in this many processes")
     args = parser.parse_args()
 
     filepath = Path(args.logfile)
@@ -224,7 +261,17 @@ def main():
         print(f"Error: File not found: {filepath}")
         return 1
 
-    episodes = parse_log_file(filepath)
+    store_path = None
+    if args.jobs > 1 and HAS_MATPLOTLIB and not args.ascii:
+        # Parse once into an episode store shared by the render workers; the
+        # directory is removed at exit (the store stays mapped until then)
+        import tempfile
+        tmp = tempfile.TemporaryDirectory(ignore_cleanup_errors=True)
+        store_path = ensure_store(filepath, Path(tmp.name) / "episodes", args.jobs)
+        episodes = EpisodeStore(store_path).columns()
+    else:
+        episodes = load_columns(filepath, args.jobs)
+
     if not episodes:
         print("No episodes found in log file.")
         return 1
@@ -243,10 +290,11 @@ def main():
 
     print(f"\nGenerating plots in: {output_path}")
 
-    plot_rewards(episodes, output_path)
-    plot_success_rate(episodes, output_path)
-    plot_outcome_distribution(episodes, output_path)
-    plot_reward_histogram(episodes, output_path)
+    if store_path:
+        render_parallel(store_path, output_path, args.jobs)
+    else:
+        for plot_figure in FIGURES.values():
+            plot_figure(episodes, output_path)
 
     print("\nDone!")
     return 0
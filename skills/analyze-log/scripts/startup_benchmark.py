@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Startup Benchmark
+
+Time the text and ASCII modes of the analysis scripts end to end, as an
+agent calling them in a loop sees them: one fresh interpreter per run. The
+baseline is an interpreter that does nothing, so the difference is what
+the script itself costs. With --imports, also list the slowest modules
+each script imports (from ``python -X importtime``).
+
+Usage:
+    python startup_benchmark.py training_output.txt
+    python startup_benchmark.py training_output.txt --runs 20 --imports
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+SCRIPTS = Path(__file__).resolve().parent
+COMPARE_SCRIPTS = SCRIPTS.parents[1] / "compare-runs" / "scripts"
+
+
+def commands(logfile: Path) -> dict[str, list[str]]:
+    """Command line (after the interpreter) of each benchmarked mode."""
+    log = str(logfile)
+    return {
+        "python (baseline)": ["-c", "pass"],
+        "log_plotter --ascii": [str(SCRIPTS / "log_plotter.py"), log, "--ascii"],
+        "log_analyzer": [str(SCRIPTS / "log_analyzer.py"), log],
+        "log_analyzer --json": [str(SCRIPTS / "log_analyzer.py"), log, "--json"],
+        "plot_comparison --ascii": [str(COMPARE_SCRIPTS / "plot_comparison.py"), log, log, "--ascii"],
+        "compare_runs": [str(COMPARE_SCRIPTS / "compare_runs.py"), log, log],
+    }
+
+
+def time_command(args: list[str], runs: int) -> float:
+    """Median wall time of ``runs`` runs of the interpreter with args, in seconds."""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *args], stdout=subprocess.DEVNULL, check=True)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def slowest_imports(args: list[str], top: int = 5) -> list[tuple[str, int]]:
+    """(module, cumulative microseconds) of the top-level imports that took longest."""
+    result = subprocess.run([sys.executable, "-X", "importtime", *args],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True)
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        # Nested imports are indented; their time is already in their parent's
+        if cumulative.strip().isdigit() and not name[1:].startswith(" "):
+            imports.append((name.strip(), int(cumulative)))
+    return sorted(imports, key=lambda item: item[1], reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time startup of the analysis scripts' text modes")
+    parser.add_argument("logfile", help="Path to a (small) training log file")
+    parser.add_argument("--runs", type=int, default=10, help="Runs per command (median reported)")
+    parser.add_argument("--imports", action="store_true", help="Also show each script's slowest imports")
+    args = parser.parse_args()
+
+    filepath = Path(args.logfile)
+    if not filepath.exists():
+        print(f"Error: File not found: {filepath}")
+        return 1
+
+    timings = {name: time_command(argv, args.runs) for name, argv in commands(filepath).items()}
+    baseline = timings["python (baseline)"]
+
+    print(f"Median of {args.runs} runs")
+    print(f"{'Command':<26} {'Wall':>9} {'Over baseline':>14}")
+    for name, elapsed in timings.items():
+        print(f"{name:<26} {elapsed * 1000:>7.0f}ms {(elapsed - baseline) * 1000:>12.0f}ms")
+
+    if args.imports:
+        for name, argv in commands(filepath).items():
+            if argv[0] == "-c":
+                continue
+            print(f"\n{name}: slowest imports")
+            for module, micros in slowest_imports(argv):
+                print(f"  {module:<30} {micros / 1000:>7.1f}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -2,20 +2,28 @@
 """
 Training Run Comparison Tool
 
-Compare metrics across multiple training runs.
+Compare metrics across multiple training runs, with bootstrap confidence
+intervals and significance tests against the best run (see run_stats.py).
 
 Usage:
     python compare_runs.py run1.txt run2.txt run3.txt
     python compare_runs.py logs/*.txt --output comparison.csv
+    python compare_runs.py logs/*.txt --jobs 0 --resamples 10000
 """
 
 import argparse
-import re
+import math
 import statistics
+import sys
+from array import array
 from pathlib import Path
 from dataclasses import dataclass
 import csv
 
+# Episode parsing is shared with the analyze-log skill
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "analyze-log" / "scripts"))
+from episode_store import load_columns
+
 
 @dataclass
 class RunMetrics:
@@ -31,89 +39,160 @@ class RunMetrics:
     min_reward: float = float('inf')
     first_success: int = -1
     final_100_success_rate: float = 0.0
+    success_rate_ci: tuple[float, float] | None = None
+    mean_reward_ci: tuple[float, float] | None = None
+    # Two-sided p-values against the best run, Holm-adjusted across runs
+    success_p_welch: float | None = None
+    success_p_mwu: float | None = None
+    reward_p_welch: float | None = None
+    reward_p_mwu: float | None = None
+
+
+@dataclass
+class RunSample:
+    """Per-episode values of a run, kept for the significance tests."""
+    rewards: array
+    successes: array
 
 
 def parse_log_file(filepath: Path) -> RunMetrics:
     """Parse a log file and extract metrics."""
-    name = filepath.stem
-    episodes = []
+    return parse_run(filepath)[0]
 
-    pattern = r"Run (\d+)\s*([✓✗])\s*\w+.*Reward:\s*([\d.-]+)"
 
-    with open(filepath, encoding='utf-8', errors='ignore') as f:
-        for line in f:
-            match = re.search(pattern, line)
-            if match:
-                episodes.append({
-                    'number': int(match.group(1)),
-                    'success': match.group(2) == '✓',
-                    'reward': float(match.group(3))
-                })
+def parse_run(filepath: Path) -> tuple[RunMetrics, RunSample]:
+    """Parse a log file into its metrics and per-episode sample (run in a worker process)."""
+    name = filepath.stem
+    episodes = load_columns(filepath)
+    sample = RunSample(array("d", episodes.rewards), array("B", episodes.successes))
 
     if not episodes:
-        return RunMetrics(name=name, file=str(filepath))
-
-    rewards = [e['reward'] for e in episodes]
-    successes = [e for e in episodes if e['success']]
+        return RunMetrics(name=name, file=str(filepath)), sample
 
-    # Find first success
-    first_success = -1
-    for e in episodes:
-        if e['success']:
-            first_success = e['number']
-            break
+    rewards = episodes.rewards
+    successes = episodes.n_successes()
+    first_success = episodes.first_success()
 
     # Final 100 episodes
     final_100 = episodes[-100:] if len(episodes) >= 100 else episodes
-    final_100_successes = sum(1 for e in final_100 if e['success'])
+    final_100_successes = final_100.n_successes()
 
     return RunMetrics(
         name=name,
         file=str(filepath),
         total_episodes=len(episodes),
-        successes=len(successes),
-        success_rate=len(successes) / len(episodes),
+        successes=successes,
+        success_rate=successes / len(episodes),
         mean_reward=statistics.mean(rewards),
         std_reward=statistics.stdev(rewards) if len(rewards) > 1 else 0,
         max_reward=max(rewards),
         min_reward=min(rewards),
         first_success=first_success,
         final_100_success_rate=final_100_successes / len(final_100)
-    )
+    ), sample
 
 
-def compare_runs(log_files: list[Path]) -> list[RunMetrics]:
-    """Parse and compare multiple runs."""
-    metrics = []
+def compare_runs(log_files: list[Path], jobs: int = 1, resamples: int = 10000,
+                 confidence: float = 0.95, seed: int = 0) -> list[RunMetrics]:
+    """Parse and compare multiple runs.
 
+    Logs are parsed in ``jobs`` processes (0 = one per CPU). Unless
+    ``resamples`` is 0, each run gets bootstrap intervals for its success
+    rate and mean reward, and every run is tested against the best one.
+    """
+    existing = []
     for filepath in log_files:
         if filepath.exists():
-            run_metrics = parse_log_file(filepath)
-            metrics.append(run_metrics)
+            existing.append(filepath)
         else:
             print(f"Warning: File not found: {filepath}")
 
+    if jobs != 1 and len(existing) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=jobs or None) as pool:
+            runs = list(pool.map(parse_run, existing))
+    else:
+        runs = list(map(parse_run, existing))
+
     # Sort by success rate (descending)
-    metrics.sort(key=lambda x: x.success_rate, reverse=True)
+    runs.sort(key=lambda run: run[0].success_rate, reverse=True)
+
+    if resamples and runs:
+        add_intervals(runs, resamples, confidence, seed)
+        test_against_best(runs)
+
+    return [metrics for metrics, _ in runs]
+
+
+def add_intervals(runs: list[tuple[RunMetrics, RunSample]], resamples: int, confidence: float, seed: int):
+    """Set each run's bootstrap intervals for success rate and mean reward."""
+    # Imported here: run_stats pulls in NumPy, which --resamples 0 never needs
+    from run_stats import bootstrap_mean_cis, bootstrap_rate_ci
 
-    return metrics
+    reward_cis = bootstrap_mean_cis([sample.rewards for _, sample in runs], resamples, confidence, seed)
+    for i, ((metrics, _), reward_ci) in enumerate(zip(runs, reward_cis)):
+        if metrics.total_episodes:
+            metrics.mean_reward_ci = reward_ci
+            metrics.success_rate_ci = bootstrap_rate_ci(metrics.successes, metrics.total_episodes,
+                                                        resamples, confidence, seed + i)
 
 
-def format_comparison_table(metrics: list[RunMetrics]) -> str:
+def test_against_best(runs: list[tuple[RunMetrics, RunSample]]):
+    """Set p-values of each run against the first (best), Holm-adjusted per test."""
+    from run_stats import holm, mann_whitney_test, welch_test
+
+    best = runs[0][1]
+    others = [(metrics, sample) for metrics, sample in runs[1:] if len(sample.rewards) >= 2]
+    if len(best.rewards) < 2 or not others:
+        return
+
+    tests = {
+        "success_p_welch": lambda sample: welch_test(best.successes, sample.successes),
+        "success_p_mwu": lambda sample: mann_whitney_test(best.successes, sample.successes),
+        "reward_p_welch": lambda sample: welch_test(best.rewards, sample.rewards),
+        "reward_p_mwu": lambda sample: mann_whitney_test(best.rewards, sample.rewards),
+    }
+    for field, test in tests.items():
+        adjusted = holm([test(sample)[1] for _, sample in others])
+        for (metrics, _), p in zip(others, adjusted):
+            setattr(metrics, field, p)
+
+
+def format_interval(interval: tuple[float, float] | None, spec: str) -> str:
+    """'[low, high]' with both bounds in the given format, or '' if there's no interval."""
+    if interval is None or math.isnan(interval[0]):
+        return ""
+    return f"[{interval[0]:{spec}}, {interval[1]:{spec}}]"
+
+
+def format_p(p: float | None) -> str:
+    return "n/a" if p is None else f"{p:.4f}" if p >= 0.0001 else "<0.0001"
+
+
+def is_significant(p_welch: float | None, p_mwu: float | None, alpha: float) -> bool:
+    """Whether both tests reject equality with the best run at level alpha."""
+    return p_welch is not None and p_mwu is not None and max(p_welch, p_mwu) < alpha
+
+
+def format_comparison_table(metrics: list[RunMetrics], confidence: float = 0.95) -> str:
     """Format metrics as a comparison table."""
     if not metrics:
         return "No runs to compare."
 
     output = []
+    width = 124
+    ci_label = f"{confidence:.0%} CI"
 
     # Header
-    output.append("=" * 90)
+    output.append("=" * width)
     output.append("TRAINING RUN COMPARISON")
-    output.append("=" * 90)
+    output.append("=" * width)
 
     # Table header
-    output.append(f"\n{'Run':<30} {'Episodes':>8} {'Success%':>10} {'Mean Rwd':>10} {'Max Rwd':>10} {'1st Success':>12}")
-    output.append("-" * 90)
+    output.append(f"\n{'Run':<30} {'Episodes':>8} {'Success%':>10} {ci_label:^16} "
+                  f"{'Mean Rwd':>10} {ci_label:^18} {'Max Rwd':>10} {'1st Success':>12}")
+    output.append("-" * width)
 
     # Rows
     for i, m in enumerate(metrics):
@@ -122,16 +201,40 @@ def format_comparison_table(metrics: list[RunMetrics]) -> str:
 
         output.append(
             f"{m.name:<28}{star} {m.total_episodes:>8} {m.success_rate:>9.1%} "
-            f"{m.mean_reward:>10.1f} {m.max_reward:>10.1f} {first_success_str:>12}"
+            f"{format_interval(m.success_rate_ci, '.1%'):^16} {m.mean_reward:>10.1f} "
+            f"{format_interval(m.mean_reward_ci, '.1f'):^18} {m.max_reward:>10.1f} {first_success_str:>12}"
         )
 
-    output.append("-" * 90)
+    output.append("-" * width)
+
+    # Significance against the best run
+    alpha = 1 - confidence
+    tested = [m for m in metrics[1:] if m.success_p_welch is not None]
+    if tested:
+        output.append(f"\nAgainst {metrics[0].name}: two-sided p-values, Holm-adjusted over {len(tested)} runs "
+                      f"(* = Welch and Mann-Whitney both < {alpha:.2g})")
+        output.append(f"{'Run':<30} {'Success Welch':>14} {'Success MWU':>12}   {'Reward Welch':>13} {'Reward MWU':>11}")
+        for m in tested:
+            success_mark = "*" if is_significant(m.success_p_welch, m.success_p_mwu, alpha) else " "
+            reward_mark = "*" if is_significant(m.reward_p_welch, m.reward_p_mwu, alpha) else " "
+            output.append(
+                f"{m.name:<30} {format_p(m.success_p_welch):>14} {format_p(m.success_p_mwu):>12} {success_mark} "
+                f"{format_p(m.reward_p_welch):>13} {format_p(m.reward_p_mwu):>11} {reward_mark}"
+            )
+        output.append("-" * width)
 
     # Summary
     if metrics:
         best = metrics[0]
         output.append(f"\nBest run: {best.name} ({best.success_rate:.1%} success rate)")
 
+        if tested:
+            ties = [m.name for m in tested if not is_significant(m.success_p_welch, m.success_p_mwu, alpha)]
+            if ties:
+                output.append(f"Not significantly worse on success rate: {', '.join(ties)}")
+            else:
+                output.append(f"Significantly ahead of every other run on success rate (p < {alpha:.2g})")
+
         # Performance spread
         if len(metrics) > 1:
             worst = metrics[-1]
@@ -152,11 +255,20 @@ def format_detailed_comparison(metrics: list[RunMetrics]) -> str:
         output.append(f"  File: {m.file}")
         output.append(f"  Episodes: {m.total_episodes}")
         output.append(f"  Success Rate: {m.success_rate:.1%} ({m.successes}/{m.total_episodes})")
+        if m.success_rate_ci:
+            output.append(f"  Success Rate CI: {format_interval(m.success_rate_ci, '.1%')}")
         output.append(f"  Mean Reward: {m.mean_reward:.1f} (std: {m.std_reward:.1f})")
+        if m.mean_reward_ci:
+            output.append(f"  Mean Reward CI: {format_interval(m.mean_reward_ci, '.1f')}")
         output.append(f"  Max Reward: {m.max_reward:.1f}")
         output.append(f"  Min Reward: {m.min_reward:.1f}")
         output.append(f"  First Success: Episode {m.first_success if m.first_success > 0 else 'N/A'}")
         output.append(f"  Final 100 Success Rate: {m.final_100_success_rate:.1%}")
+        if m.success_p_welch is not None:
+            output.append(f"  vs Best, Success Rate p: {format_p(m.success_p_welch)} (Welch), "
+                          f"{format_p(m.success_p_mwu)} (Mann-Whitney)")
+            output.append(f"  vs Best, Mean Reward p: {format_p(m.reward_p_welch)} (Welch), "
+                          f"{format_p(m.reward_p_mwu)} (Mann-Whitney)")
 
     return '\n'.join(output)
 
@@ -168,31 +280,49 @@ def export_csv(metrics: list[RunMetrics], filepath: Path):
         writer.writerow([
             'rank', 'name', 'file', 'episodes', 'successes', 'success_rate',
             'mean_reward', 'std_reward', 'max_reward', 'min_reward',
-            'first_success', 'final_100_success_rate'
+            'first_success', 'final_100_success_rate',
+            'success_rate_ci_low', 'success_rate_ci_high', 'mean_reward_ci_low', 'mean_reward_ci_high',
+            'success_p_welch', 'success_p_mwu', 'reward_p_welch', 'reward_p_mwu'
         ])
 
         for i, m in enumerate(metrics, 1):
+            success_ci = [f"{bound:.4f}" for bound in m.success_rate_ci] if m.success_rate_ci else ["", ""]
+            reward_ci = [f"{bound:.2f}" for bound in m.mean_reward_ci] if m.mean_reward_ci else ["", ""]
             writer.writerow([
                 i, m.name, m.file, m.total_episodes, m.successes,
                 f"{m.success_rate:.4f}", f"{m.mean_reward:.2f}", f"{m.std_reward:.2f}",
                 f"{m.max_reward:.2f}", f"{m.min_reward:.2f}",
-                m.first_success, f"{m.final_100_success_rate:.4f}"
+                m.first_success, f"{m.final_100_success_rate:.4f}",
+                *success_ci, *reward_ci,
+                *("" if p is None else f"{p:.6g}"
+                  for p in (m.success_p_welch, m.success_p_mwu, m.reward_p_welch, m.reward_p_mwu))
             ])
 
 
 def main():
     parser = argparse.ArgumentParser(description="Compare training runs")
-    parser.add_argument("logs", nargs="+", help="Log files to compare")
+    parser.add_argument("logs", nargs="+", help="Log files (or episode stores) to compare")
     parser.add_argument("--output", "-o", help="Export to CSV file")
     parser.add_argument("--detailed", "-d", action="store_true", help="Show detailed comparison")
     parser.add_argument("--json", action="store_true", help="Output as JSON")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="Parse the logs in this many processes (0 = one per CPU)")
+    parser.add_argument("--resamples", type=int, default=10000,
+                        help="Bootstrap resamples for confidence intervals (0 = no intervals or tests)")
+    parser.add_argument("--confidence", type=float, default=0.95,
+                        help="Confidence level of the intervals (significance level is 1 - this)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for bootstrap resampling")
     args = parser.parse_args()
 
+    if args.resamples < 0 or not 0 < args.confidence < 1:
+        print("Error: --resamples must be non-negative and --confidence between 0 and 1")
+        return 1
+
     log_files = [Path(f) for f in args.logs]
 
     print(f"Comparing {len(log_files)} runs...")
 
-    metrics = compare_runs(log_files)
+    metrics = compare_runs(log_files, args.jobs, args.resamples, args.confidence, args.seed)
 
     if not metrics:
         print("No valid runs found.")
@@ -203,7 +333,7 @@ def main():
         data = [vars(m) for m in metrics]
         print(json.dumps(data, indent=2))
     else:
-        print(format_comparison_table(metrics))
+        print(format_comparison_table(metrics, args.confidence))
 
         if args.detailed:
             print(format_detailed_comparison(metrics))
@@ -7,51 +7,77 @@ Generate visual comparisons of multiple training runs.
 Usage:
     python plot_comparison.py run1.txt run2.txt run3.txt
     python plot_comparison.py logs/*.txt --output charts/
+    python plot_comparison.py logs/*.txt --jobs 4
 """
 
 import argparse
-import re
+import importlib.util
+import sys
+from itertools import repeat
 from pathlib import Path
-from dataclasses import dataclass
-
-try:
-    import matplotlib.pyplot as plt
-    import matplotlib
-    matplotlib.use('Agg')
-    HAS_MATPLOTLIB = True
-except ImportError:
-    HAS_MATPLOTLIB = False
-
-
-@dataclass
-class Episode:
-    number: int
-    success: bool
-    reward: float
 
+# Episode parsing is shared with the analyze-log skill
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "analyze-log" / "scripts"))
+from episode_parser import EpisodeColumns
+from episode_store import EpisodeStore, ensure_store, load_columns
+from log_plotter import DPI, pixel_columns
 
-def parse_log_file(filepath: Path) -> tuple[str, list[Episode]]:
-    """Parse a log file and return name and episodes."""
-    name = filepath.stem
-    episodes = []
+# matplotlib (and NumPy, which it requires) is imported only when a figure
+# is drawn: it dominates startup time, and the ASCII output never needs it
+HAS_MATPLOTLIB = importlib.util.find_spec("matplotlib") is not None
 
-    pattern = r"Run (\d+)\s*([✓✗])\s*\w+.*Reward:\s*([\d.-]+)"
 
-    with open(filepath, encoding='utf-8', errors='ignore') as f:
-        for line in f:
-            match = re.search(pattern, line)
-            if match:
-                episodes.append(Episode(
-                    number=int(match.group(1)),
-                    success=match.group(2) == '✓',
-                    reward=float(match.group(3))
-                ))
-
-    return name, episodes
-
-
-def plot_reward_comparison(runs: dict[str, list[Episode]], output_path: Path):
+def pyplot():
+    """matplotlib.pyplot on the non-interactive Agg backend, imported on first use."""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def run_labels(paths: list[Path]) -> list[str]:
+    """A unique label per log: its file stem, led by as many parent
+    directories as it takes to tell apart logs with the same stem.
+
+    ``a/train.log`` and ``b/train.log`` become ``a/train`` and ``b/train``;
+    a log given twice gets a ``#2`` suffix.
+    """
+    resolved = [path.resolve() for path in paths]
+    distinct = list(dict.fromkeys(resolved))
+    parents = {path: path.parent.relative_to(path.anchor).parts for path in distinct}
+    depths = dict.fromkeys(distinct, 0)
+
+    def label(path: Path) -> str:
+        parts = parents[path]
+        return "/".join([*parts[len(parts) - depths[path]:], path.stem])
+
+    while True:
+        groups = {}
+        for path in distinct:
+            groups.setdefault(label(path), []).append(path)
+        grow = [path for group in groups.values() if len(group) > 1
+                for path in group if depths[path] < len(parents[path])]
+        if not grow:
+            break
+        for path in grow:
+            depths[path] += 1
+
+    labels = []
+    counts = {}
+    for path in resolved:
+        name = label(path)
+        counts[name] = counts.get(name, 0) + 1
+        labels.append(name if counts[name] == 1 else f"{name}#{counts[name]}")
+    return labels
+
+
+def plot_reward_comparison(runs: dict[str, EpisodeColumns], output_path: Path):
     """Plot reward curves for all runs on same chart."""
+    import numpy as np
+    from decimate import lttb_indices
+    from learning_curve import rolling_mean
+    plt = pyplot()
+
     fig, ax = plt.subplots(figsize=(14, 7))
 
     colors = plt.cm.tab10(range(len(runs)))
@@ -60,16 +86,17 @@ def plot_reward_comparison(runs: dict[str, list[Episode]], output_path: Path):
         if not episodes:
             continue
 
-        x = [e.number for e in episodes]
-        y = [e.reward for e in episodes]
+        # Zero-copy arrays over the columns (matplotlib can't index memoryviews)
+        x = np.asarray(episodes.numbers)
+        y = np.asarray(episodes.rewards)
 
-        # Plot rolling average
+        # Plot rolling average, decimated to the figure's resolution
         window = 50
         if len(y) >= window:
-            rolling_avg = []
-            for i in range(len(y) - window + 1):
-                rolling_avg.append(sum(y[i:i+window]) / window)
-            ax.plot(x[window-1:], rolling_avg, label=name, color=color, linewidth=2)
+            rolling_avg = rolling_mean(y, window)
+            rolling_x = x[window-1:]
+            keep = lttb_indices(rolling_x, rolling_avg, pixel_columns(fig))
+            ax.plot(rolling_x[keep], rolling_avg[keep], label=name, color=color, linewidth=2)
 
     ax.axhline(y=200, color='green', linestyle='--', alpha=0.5, label='Success threshold')
     ax.axhline(y=0, color='gray', linestyle='-', alpha=0.3)
@@ -81,13 +108,18 @@ def plot_reward_comparison(runs: dict[str, list[Episode]], output_path: Path):
     ax.grid(True, alpha=0.3)
 
     plt.tight_layout()
-    plt.savefig(output_path / 'reward_comparison.png', dpi=150)
+    plt.savefig(output_path / 'reward_comparison.png', dpi=DPI)
     plt.close()
     print(f"  Saved: {output_path / 'reward_comparison.png'}")
 
 
-def plot_success_rate_comparison(runs: dict[str, list[Episode]], output_path: Path):
+def plot_success_rate_comparison(runs: dict[str, EpisodeColumns], output_path: Path):
     """Plot success rate curves for all runs."""
+    import numpy as np
+    from decimate import lttb_indices
+    from learning_curve import rolling_mean
+    plt = pyplot()
+
     fig, ax = plt.subplots(figsize=(14, 7))
 
     colors = plt.cm.tab10(range(len(runs)))
@@ -97,14 +129,10 @@ def plot_success_rate_comparison(runs: dict[str, list[Episode]], output_path: Pa
             continue
 
         window = 50
-        success_rates = []
-        x_values = []
-
-        for i in range(window, len(episodes) + 1):
-            window_episodes = episodes[i-window:i]
-            rate = sum(1 for e in window_episodes if e.success) / window * 100
-            success_rates.append(rate)
-            x_values.append(i)
+        success_rates = rolling_mean(episodes.successes, window) * 100
+        x_values = np.arange(window, len(episodes) + 1)
+        keep = lttb_indices(x_values, success_rates, pixel_columns(fig))
+        x_values, success_rates = x_values[keep], success_rates[keep]
 
         ax.plot(x_values, success_rates, label=name, color=color, linewidth=2)
 
@@ -119,13 +147,15 @@ def plot_success_rate_comparison(runs: dict[str, list[Episode]], output_path: Pa
     ax.grid(True, alpha=0.3)
 
     plt.tight_layout()
-    plt.savefig(output_path / 'success_rate_comparison.png', dpi=150)
+    plt.savefig(output_path / 'success_rate_comparison.png', dpi=DPI)
     plt.close()
     print(f"  Saved: {output_path / 'success_rate_comparison.png'}")
 
 
-def plot_metrics_bar_chart(runs: dict[str, list[Episode]], output_path: Path):
+def plot_metrics_bar_chart(runs: dict[str, EpisodeColumns], output_path: Path):
     """Plot bar chart comparing key metrics."""
+    plt = pyplot()
+
     if not runs:
         return
 
@@ -138,8 +168,8 @@ def plot_metrics_bar_chart(runs: dict[str, list[Episode]], output_path: Path):
 
     for name, episodes in runs.items():
         if episodes:
-            rewards = [e.reward for e in episodes]
-            successes = sum(1 for e in episodes if e.success)
+            rewards = episodes.rewards
+            successes = episodes.n_successes()
             success_rates.append(successes / len(episodes) * 100)
             mean_rewards.append(sum(rewards) / len(rewards))
             max_rewards.append(max(rewards))
@@ -171,12 +201,25 @@ def plot_metrics_bar_chart(runs: dict[str, list[Episode]], output_path: Path):
     axes[2].tick_params(axis='x', rotation=45)
 
     plt.tight_layout()
-    plt.savefig(output_path / 'metrics_comparison.png', dpi=150)
+    plt.savefig(output_path / 'metrics_comparison.png', dpi=DPI)
     plt.close()
     print(f"  Saved: {output_path / 'metrics_comparison.png'}")
 
 
-def generate_ascii_comparison(runs: dict[str, list[Episode]]) -> str:
+# Figures rendered by main(), each independent of the others
+FIGURES = {
+    "reward_comparison": plot_reward_comparison,
+    "success_rate_comparison": plot_success_rate_comparison,
+    "metrics_comparison": plot_metrics_bar_chart,
+}
+
+
+def render_from_stores(figure: str, stores: dict[str, Path], output_path: Path):
+    """Render one figure from memory-mapped episode stores (run in a worker process)."""
+    FIGURES[figure]({name: EpisodeStore(path).columns() for name, path in stores.items()}, output_path)
+
+
+def generate_ascii_comparison(runs: dict[str, EpisodeColumns]) -> str:
     """Generate ASCII comparison for environments without matplotlib."""
     output = []
     output.append("\nASCII Comparison Chart")
@@ -188,7 +231,7 @@ def generate_ascii_comparison(runs: dict[str, list[Episode]]) -> str:
         if not episodes:
             continue
 
-        successes = sum(1 for e in episodes if e.success)
+        successes = episodes.n_successes()
         success_rate = successes / len(episodes) * 100
 
         bar_len = int(success_rate / 2)
@@ -204,19 +247,36 @@ def generate_ascii_comparison(runs: dict[str, list[Episode]]) -> str:
 
 def main():
     parser = argparse.ArgumentParser(description="Plot training run comparisons")
-    parser.add_argument("logs", nargs="+", help="Log files to compare")
+    parser.add_argument("logs", nargs="+", help="Log files (or episode stores) to compare")
     parser.add_argument("--output", "-o", default=".", help="Output directory")
     parser.add_argument("--ascii", action="store_true", help="ASCII output only")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="Parse logs and render figures in this many processes")
     args = parser.parse_args()
 
-    # Parse all log files
+    paths = [Path(filepath) for filepath in args.logs if Path(filepath).exists()]
+
+    pool = None
+    if args.jobs > 1 and HAS_MATPLOTLIB and not args.ascii:
+        # Parse each log once, in parallel, into an episode store that the
+        # render workers share; the directory is removed at exit
+        import tempfile
+        from concurrent.futures import ProcessPoolExecutor
+        tmp = tempfile.TemporaryDirectory(ignore_cleanup_errors=True)
+        pool = ProcessPoolExecutor(max_workers=args.jobs)
+        store_paths = [Path(tmp.name) / f"{i}.episodes" for i in range(len(paths))]
+        stores = dict(zip(run_labels(paths), pool.map(ensure_store, paths, store_paths)))
+
+    # Parse all log files; runs are keyed by label, as logs in different
+    # directories often share a file name
     runs = {}
-    for filepath in args.logs:
-        path = Path(filepath)
-        if path.exists():
-            name, episodes = parse_log_file(path)
-            runs[name] = episodes
-            print(f"Loaded: {name} ({len(episodes)} episodes)")
+    for name, path in zip(run_labels(paths), paths):
+        if pool:
+            episodes = EpisodeStore(stores[name]).columns()
+        else:
+            episodes = load_columns(path)
+        runs[name] = episodes
+        print(f"Loaded: {name} ({len(episodes)} episodes)")
 
     if not runs:
         print("No valid runs found.")
@@ -234,9 +294,12 @@ def main():
 
     print(f"\nGenerating plots in: {output_path}")
 
-    plot_reward_comparison(runs, output_path)
-    plot_success_rate_comparison(runs, output_path)
-    plot_metrics_bar_chart(runs, output_path)
+    if pool:
+        with pool:
+            list(pool.map(render_from_stores, FIGURES, repeat(stores), repeat(output_path)))
+    else:
+        for plot_figure in FIGURES.values():
+            plot_figure(runs, output_path)
 
     print("\nDone!")
     return 0
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Run Statistics
+
+Bootstrap confidence intervals and two-sample tests for telling training
+runs apart, used by compare_runs.py.
+
+- bootstrap_mean_cis() / bootstrap_rate_ci(): percentile bootstrap
+  intervals for runs' mean rewards and success rates. With NumPy, runs of
+  the same length share one set of resamples, applied to all of them with
+  a single matrix product; a success rate's resampled count is exactly
+  Binomial(n, rate), so it costs O(resamples) whatever the run length.
+- welch_test() / mann_whitney_test(): two-sided Welch t and Mann-Whitney U
+  tests (normal approximation, tie and continuity corrected).
+- holm(): Holm step-down adjustment when one run is tested against many.
+
+p-values are computed in pure Python (math.erfc and a continued fraction
+for the t distribution), so SciPy isn't needed. NumPy is optional; without
+it the same resampling runs in pure Python, much more slowly.
+
+Usage:
+    python run_stats.py                                       # time 50 synthetic runs
+    python run_stats.py --runs 100 --episodes 5000 --resamples 10000
+"""
+
+import argparse
+import math
+import random
+import time
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+# Resample counts generated per batch (bounds memory at ~32 MB)
+BATCH_VALUES = 1 << 22
+
+# A vectorised binomial draw costs about as much as generating this many
+# resample counts, so runs with far fewer distinct rewards than episodes
+# draw a count per distinct value instead
+BINOMIAL_COST = 10
+
+
+def bootstrap_mean_cis(samples: list, resamples: int = 10000, confidence: float = 0.95,
+                       seed: int | None = None) -> list[tuple[float, float]]:
+    """Percentile bootstrap interval for the mean of each sample.
+
+    Samples of equal length share their resampling: each resample is a row
+    of multinomial counts (how often each position is drawn), and one
+    matrix product gives that resample's mean for every sample at once.
+    """
+    intervals = [(math.nan, math.nan)] * len(samples)
+    if not HAS_NUMPY:
+        rng = random.Random(seed)
+        for i, values in enumerate(samples):
+            n = len(values)
+            if n:
+                means = sorted(math.fsum(rng.choices(values, k=n)) / n for _ in range(resamples))
+                intervals[i] = _interval(means, confidence)
+        return intervals
+
+    rng = np.random.default_rng(seed)
+    by_length = {}
+    for i, values in enumerate(samples):
+        if len(values):
+            by_length.setdefault(len(values), []).append(i)
+    for n, members in by_length.items():
+        columns = [np.asarray(samples[i], dtype=np.float64) for i in members]
+        distinct = [np.unique(values, return_counts=True) for values in columns]
+        if sum(len(values) for values, _ in distinct) * BINOMIAL_COST < n:
+            means = np.column_stack([_resample_counts(values, counts, resamples, rng)
+                                     for values, counts in distinct])
+        else:
+            means = _resample_positions(np.column_stack(columns), resamples, rng)
+        means.sort(axis=0)
+        for column, i in enumerate(members):
+            intervals[i] = _interval(means[:, column], confidence)
+    return intervals
+
+
+def bootstrap_mean_ci(values, resamples: int = 10000, confidence: float = 0.95,
+                      seed: int | None = None) -> tuple[float, float]:
+    """Percentile bootstrap interval for the mean of values."""
+    return bootstrap_mean_cis([values], resamples, confidence, seed)[0]
+
+
+def bootstrap_rate_ci(successes: int, n: int, resamples: int = 10000, confidence: float = 0.95,
+                      seed: int | None = None) -> tuple[float, float]:
+    """Percentile bootstrap interval for a success rate of successes / n."""
+    if n == 0:
+        return math.nan, math.nan
+    if not HAS_NUMPY:
+        return bootstrap_mean_ci([1.0] * successes + [0.0] * (n - successes), resamples, confidence, seed)
+    rng = np.random.default_rng(seed)
+    return _interval(np.sort(rng.binomial(n, successes / n, size=resamples) / n), confidence)
+
+
+def _resample_positions(columns, resamples: int, rng):
+    """Resampled means of each column of an (episodes x samples) matrix, a batch of rows at a time."""
+    n = len(columns)
+    rows = max(1, BATCH_VALUES // n)
+    index_type = np.int32 if rows * n < 2**31 else np.int64
+    means = np.empty((resamples, columns.shape[1]))
+    for start in range(0, resamples, rows):
+        batch = min(rows, resamples - start)
+        # Offset each row's draws so one bincount counts every row
+        draws = rng.integers(0, n, size=(batch, n), dtype=index_type)
+        draws += (np.arange(batch, dtype=index_type) * n)[:, None]
+        counts = np.bincount(draws.ravel(), minlength=batch * n).reshape(batch, n)
+        means[start:start + batch] = counts @ columns / n
+    return means
+
+
+def _resample_counts(distinct, counts, resamples: int, rng):
+    """Resampled means drawn as multinomial counts of each distinct value.
+
+    Equivalent to resampling the episodes, at a cost proportional to the
+    number of distinct values: each value's count is binomial given the
+    draws still unassigned.
+    """
+    n = int(counts.sum())
+    unassigned = np.full(resamples, n, dtype=np.int64)
+    sums = np.zeros(resamples)
+    left = n
+    for value, count in zip(distinct[:-1].tolist(), counts[:-1].tolist()):
+        drawn = rng.binomial(unassigned, count / left)
+        sums += drawn * value
+        unassigned -= drawn
+        left -= count
+    sums += unassigned * float(distinct[-1])
+    return sums / n
+
+
+def _interval(sorted_values, confidence: float) -> tuple[float, float]:
+    """Central ``confidence`` interval of sorted values (linear interpolation, as numpy.quantile)."""
+    tail = (1 - confidence) / 2
+    return _quantile(sorted_values, tail), _quantile(sorted_values, 1 - tail)
+
+
+def _quantile(sorted_values, q: float) -> float:
+    position = q * (len(sorted_values) - 1)
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    fraction = position - lower
+    return float(sorted_values[lower] * (1 - fraction) + sorted_values[upper] * fraction)
+
+
+def welch_test(a, b) -> tuple[float, float]:
+    """(t, two-sided p) of Welch's unequal-variance t test; a and b need two values each."""
+    na, mean_a, var_a = _moments(a)
+    nb, mean_b, var_b = _moments(b)
+    se_a, se_b = var_a / na, var_b / nb
+    if se_a + se_b == 0:
+        return (0.0, 1.0) if mean_a == mean_b else (math.copysign(math.inf, mean_a - mean_b), 0.0)
+    t = (mean_a - mean_b) / math.sqrt(se_a + se_b)
+    df = (se_a + se_b) ** 2 / (se_a ** 2 / (na - 1) + se_b ** 2 / (nb - 1))
+    return t, _betainc(df / 2, 0.5, df / (df + t * t))
+
+
+def _moments(values) -> tuple[int, float, float]:
+    """(count, mean, sample variance) of values."""
+    n = len(values)
+    if HAS_NUMPY:
+        values = np.asarray(values, dtype=np.float64)
+        return n, float(values.mean()), float(values.var(ddof=1))
+    mean = math.fsum(values) / n
+    return n, mean, math.fsum((x - mean) ** 2 for x in values) / (n - 1)
+
+
+def mann_whitney_test(a, b) -> tuple[float, float]:
+    """(U of a, two-sided p) of the Mann-Whitney U test, by normal approximation."""
+    na, nb = len(a), len(b)
+    if HAS_NUMPY:
+        pooled = np.concatenate((np.asarray(a, dtype=np.float64), np.asarray(b, dtype=np.float64)))
+        _, inverse, ties = np.unique(pooled, return_inverse=True, return_counts=True)
+        # Tied values share the mean of the ranks they span
+        ranks = np.cumsum(ties) - (ties - 1) / 2
+        rank_sum = float(ranks[inverse[:na]].sum())
+        ties = ties.astype(np.float64)
+        tie_term = float((ties ** 3 - ties).sum())
+    else:
+        pooled = sorted([(x, True) for x in a] + [(x, False) for x in b])
+        rank_sum = tie_term = 0.0
+        start = 0
+        while start < len(pooled):
+            end = start
+            while end < len(pooled) and pooled[end][0] == pooled[start][0]:
+                end += 1
+            rank = (start + end + 1) / 2
+            rank_sum += rank * sum(1 for _, in_a in pooled[start:end] if in_a)
+            tie_term += (end - start) ** 3 - (end - start)
+            start = end
+
+    u = rank_sum - na * (na + 1) / 2
+    n = na + nb
+    variance = na * nb / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        return u, 1.0
+    z = max(abs(u - na * nb / 2) - 0.5, 0.0) / math.sqrt(variance)
+    return u, min(1.0, math.erfc(z / math.sqrt(2)))
+
+
+def _betainc(a: float, b: float, x: float) -> float:
+    """Regularized incomplete beta function I_x(a, b).
+
+    I_x(df/2, 1/2) at x = df / (df + t^2) is the two-sided p-value of t
+    under Student's t distribution with df degrees of freedom.
+    """
+    if x <= 0:
+        return 0.0
+    if x >= 1:
+        return 1.0
+    front = math.exp(math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b)
+                     + a * math.log(x) + b * math.log1p(-x))
+    # The continued fraction converges fast on this side of the mean
+    if x < (a + 1) / (a + b + 2):
+        return front * _beta_fraction(a, b, x) / a
+    return 1 - front * _beta_fraction(b, a, 1 - x) / b
+
+
+def _beta_fraction(a: float, b: float, x: float) -> float:
+    """Continued fraction for the incomplete beta function (modified Lentz)."""
+    tiny = 1e-300
+    c = 1.0
+    d = 1 - (a + b) * x / (a + 1)
+    d = 1 / (d if abs(d) > tiny else tiny)
+    fraction = d
+    for m in range(1, 100000):
+        for numerator in (m * (b - m) * x / ((a + 2 * m - 1) * (a + 2 * m)),
+                          -(a + m) * (a + b + m) * x / ((a + 2 * m) * (a + 2 * m + 1))):
+            d = 1 + numerator * d
+            d = 1 / (d if abs(d) > tiny else tiny)
+            c = 1 + numerator / c
+            c = c if abs(c) > tiny else tiny
+            fraction *= c * d
+        if abs(c * d - 1) < 1e-15:
+            break
+    return fraction
+
+
+def holm(pvalues: list[float]) -> list[float]:
+    """Holm-adjusted p-values: family-wise error control across all the tests."""
+    m = len(pvalues)
+    adjusted = [0.0] * m
+    running = 0.0
+    for rank, i in enumerate(sorted(range(m), key=pvalues.__getitem__)):
+        running = max(running, min(1.0, (m - rank) * pvalues[i]))
+        adjusted[i] = running
+    return adjusted
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time bootstrap intervals and tests on synthetic runs")
+    parser.add_argument("--runs", type=int, default=50, help="Number of runs")
+    parser.add_argument("--episodes", type=int, default=2000, help="Episodes per run")
+    parser.add_argument("--resamples", type=int, default=10000, help="Bootstrap resamples")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    runs = []
+    for i in range(args.runs):
+        skill = i / max(1, args.runs - 1)
+        rewards = [round(rng.gauss(-50 + 150 * skill, 120), 1) for _ in range(args.episodes)]
+        runs.append((rewards, [1.0 if r >= 100 else 0.0 for r in rewards]))
+
+    start = time.perf_counter()
+    bootstrap_mean_cis([rewards for rewards, _ in runs], args.resamples, seed=0)
+    for seed, (_, successes) in enumerate(runs):
+        bootstrap_rate_ci(int(sum(successes)), len(successes), args.resamples, seed=seed)
+    bootstrap_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    best_rewards, best_successes = runs[-1]
+    for rewards, successes in runs[:-1]:
+        for best, other in ((best_rewards, rewards), (best_successes, successes)):
+            welch_test(best, other)
+            mann_whitney_test(best, other)
+    test_time = time.perf_counter() - start
+
+    print(f"{args.runs} runs x {args.episodes:,} episodes, {args.resamples:,} resamples "
+          f"({'NumPy' if HAS_NUMPY else 'pure Python'})")
+    print(f"  bootstrap intervals:  {bootstrap_time:8.3f}s")
+    print(f"  tests against best:   {test_time:8.3f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
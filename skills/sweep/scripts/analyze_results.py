@@ -7,18 +7,69 @@ Analyze and summarize hyperparameter sweep results.
 Usage:
     python analyze_results.py sweep_results/my_sweep_20240115/
     python analyze_results.py sweep_results/my_sweep_20240115/ --top 5
+    python analyze_results.py sweep_results/my_sweep_20240115/ --interactions
+    python analyze_results.py sweep_results/my_sweep_20240115/ --importance --suggest-config refined.json
+    python analyze_results.py sweep_results/my_sweep_20240115/ --follow   # while it runs
 """
 
 import argparse
+import bisect
 import json
 import csv
+import itertools
+import math
+import os
+import sys
+import time
+from collections import deque
 from pathlib import Path
 from typing import Optional
 
 
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+
+# Per-run cost measurements written by sweep_runner.py
+RESOURCE_COLUMNS = ["wall_time_s", "cpu_user_s", "cpu_sys_s", "peak_rss_mb", "episodes_per_sec"]
+
+# Numeric parameters with more distinct values than this (random/bayes
+# sweeps) are cut into this many equal-count bins for the importance analysis
+IMPORTANCE_BINS = 4
+
+# Parameters explaining less than this share of the variance are fixed at
+# their best value in a suggested follow-up config
+IMPORTANCE_THRESHOLD = 0.05
+
+
+def load_results_jsonl(results_path: Path) -> list[dict]:
+    """Load append-only results, keeping the last record for each run.
+
+    A run retried on --resume appears more than once; a truncated final line
+    (from a crash mid-append) is skipped.
+    """
+    by_run = {}
+    with open(results_path) as f:
+        for line in f:
+            try:
+                result = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            by_run[result.get("run_id")] = result
+    return list(by_run.values())
+
+
 def load_results(results_dir: Path) -> tuple[dict, list[dict]]:
-    """Load sweep config and results from directory."""
+    """Load sweep config and results from directory.
+
+    Reads results.jsonl, falling back to the legacy results.json and then
+    summary.csv.
+    """
     config_path = results_dir / "sweep_config.json"
+    jsonl_path = results_dir / "results.jsonl"
     results_path = results_dir / "results.json"
     summary_path = results_dir / "summary.csv"
 
@@ -29,7 +80,9 @@ def load_results(results_dir: Path) -> tuple[dict, list[dict]]:
         with open(config_path) as f:
             config = json.load(f)
 
-    if results_path.exists():
+    if jsonl_path.exists():
+        results = load_results_jsonl(jsonl_path)
+    elif results_path.exists():
         with open(results_path) as f:
             results = json.load(f)
     elif summary_path.exists():
@@ -40,38 +93,397 @@ def load_results(results_dir: Path) -> tuple[dict, list[dict]]:
     return config, results
 
 
+def metric_value(result: dict, key: str) -> Optional[float]:
+    """Numeric metric from a result, or None if missing (older sweeps, blank CSV cells)."""
+    value = result.get(key)
+    if value in (None, ""):
+        return None
+    return float(value)
+
+
+def time_to_first_success(result: dict) -> Optional[float]:
+    """Estimated seconds of training until the first success (cost to solve)."""
+    first_success = metric_value(result, "episodes_to_first_success")
+    episodes_per_sec = metric_value(result, "episodes_per_sec")
+    if first_success is None or first_success < 0 or not episodes_per_sec:
+        return None
+    return first_success / episodes_per_sec
+
+
+def _column(values: list[float]):
+    """Numeric column: a NumPy array when available, else a plain list."""
+    return np.asarray(values, dtype=float) if HAS_NUMPY else values
+
+
+def _group_sums(codes, values, n_groups: int) -> tuple[list[float], list[int]]:
+    """Sum and count of ``values`` per group code, ignoring code -1 and NaN values."""
+    if HAS_NUMPY:
+        mask = (codes >= 0) & ~np.isnan(values)
+        sums = np.bincount(codes[mask], weights=values[mask], minlength=n_groups)
+        counts = np.bincount(codes[mask], minlength=n_groups)
+        return sums.tolist(), counts.tolist()
+
+    sums = [0.0] * n_groups
+    counts = [0] * n_groups
+    for code, value in zip(codes, values):
+        if code >= 0 and not math.isnan(value):
+            sums[code] += value
+            counts[code] += 1
+    return sums, counts
+
+
+def _between_ss(codes, values, n_groups: int) -> tuple[float, int]:
+    """Between-group sum of squares of ``values`` and the number of non-empty groups."""
+    sums, counts = _group_sums(codes, values, n_groups)
+    n = sum(counts)
+    if not n:
+        return 0.0, 0
+    grand = sum(sums) / n
+    return (sum(c * (s / c - grand) ** 2 for s, c in zip(sums, counts) if c),
+            sum(1 for c in counts if c))
+
+
+def _finite(column) -> list[float]:
+    """Non-NaN values of a column."""
+    if HAS_NUMPY:
+        return column[~np.isnan(column)].tolist()
+    return [v for v in column if not math.isnan(v)]
+
+
+class ResultTable:
+    """Sweep results loaded once into columns.
+
+    Metrics become float columns (NaN where a run didn't record them) and
+    every parameter is factorised into integer codes plus its distinct
+    values, so group-bys, marginal means and interaction tables are single
+    vectorised passes (``np.bincount``) instead of loops over result dicts.
+    Without NumPy the same operations run as plain Python loops.
+    """
+
+    def __init__(self, results: list[dict], parameters):
+        self.results = results
+        self.n = len(results)
+
+        def metric(key: str, default: float = math.nan):
+            values = [r.get(key) for r in results]
+            return _column([default if v is None or v == "" else float(v) for v in values])
+
+        self.success_rate = metric("success_rate", 0.0)
+        self.mean_reward = metric("mean_reward", 0.0)
+        self.wall_time = metric("wall_time_s")
+        self.peak_rss = metric("peak_rss_mb")
+        self.first_success = metric("episodes_to_first_success")
+        self.episodes_per_sec = metric("episodes_per_sec")
+        self.full_length = _column([0.0 if r.get("episodes_trained") else 1.0 for r in results])
+
+        self.codes = {}
+        self.levels = {}
+        for param in parameters:
+            index = {}
+            codes = []
+            for r in results:
+                params = r.get("params", r)
+                if param in params:
+                    codes.append(index.setdefault(params[param], len(index)))
+                else:
+                    codes.append(-1)
+            self.codes[param] = np.asarray(codes, dtype=np.int64) if HAS_NUMPY else codes
+            self.levels[param] = list(index)
+
+    def ranking(self) -> list[int]:
+        """Row indices best first: full-length runs above stopped ones, then success rate."""
+        if HAS_NUMPY:
+            order = np.lexsort((-np.arange(self.n), self.success_rate, self.full_length))
+            return order[::-1].tolist()
+        return sorted(range(self.n), reverse=True,
+                      key=lambda i: (self.full_length[i], self.success_rate[i], -i))
+
+    def marginal_means(self, param: str) -> dict:
+        """Average metrics for each value of a parameter."""
+        levels = self.levels[param]
+        codes = self.codes[param]
+        success_sums, counts = _group_sums(codes, self.success_rate, len(levels))
+        reward_sums, _ = _group_sums(codes, self.mean_reward, len(levels))
+        wall_sums, wall_counts = _group_sums(codes, self.wall_time, len(levels))
+
+        analysis = {}
+        for code, value in enumerate(levels):
+            if counts[code] == 0:
+                continue
+            analysis[value] = {
+                "avg_success_rate": success_sums[code] / counts[code],
+                "avg_mean_reward": reward_sums[code] / counts[code],
+                "avg_wall_time": wall_sums[code] / wall_counts[code] if wall_counts[code] else None,
+                "n_runs": counts[code],
+            }
+        return analysis
+
+    def interaction_table(self, param_a: str, param_b: str) -> dict:
+        """Average success rate for every (group_a, group_b) pair seen.
+
+        Parameters are grouped as by importance_groups(), so continuous
+        ranges are binned rather than giving a row or column per run. Keys
+        are group labels (see group_labels()).
+        """
+        codes_a, groups_a = self.importance_groups(param_a)
+        codes_b, groups_b = self.importance_groups(param_b)
+        if HAS_NUMPY:
+            codes = np.where((codes_a >= 0) & (codes_b >= 0), codes_a * len(groups_b) + codes_b, -1)
+        else:
+            codes = [a * len(groups_b) + b if a >= 0 and b >= 0 else -1
+                     for a, b in zip(codes_a, codes_b)]
+        sums, counts = _group_sums(codes, self.success_rate, len(groups_a) * len(groups_b))
+
+        table = {}
+        for (i, a), (j, b) in itertools.product(enumerate(groups_a), enumerate(groups_b)):
+            cell = i * len(groups_b) + j
+            if counts[cell]:
+                table[(_group_label(a), _group_label(b))] = {
+                    "avg_success_rate": sums[cell] / counts[cell], "n_runs": counts[cell]}
+        return table
+
+    def group_labels(self, param: str) -> list:
+        """Labels of a parameter's non-empty importance_groups(), in value order."""
+        _, groups = self.importance_groups(param)
+        return [_group_label(group) for group in sorted(filter(None, groups),
+                                                        key=lambda g: _level_sort_key(g[0]))]
+
+    def importance_groups(self, param: str, max_groups: int = IMPORTANCE_BINS) -> tuple:
+        """Group codes for a parameter and the values falling in each group.
+
+        Parameters with few distinct values are grouped by value. Numeric
+        parameters with more (continuous ranges) are cut into ``max_groups``
+        bins of roughly equal run counts, in value order.
+        """
+        levels = self.levels[param]
+        codes = self.codes[param]
+        if len(levels) <= max_groups or any(_level_sort_key(v)[0] for v in levels):
+            return codes, [[value] for value in levels]
+
+        _, counts = _group_sums(codes, _column([0.0] * self.n), len(levels))
+        total = sum(counts)
+        lookup = [0] * len(levels)
+        groups = [[] for _ in range(max_groups)]
+        seen = 0
+        for code in sorted(range(len(levels)), key=lambda c: _level_sort_key(levels[c])):
+            group = min(seen * max_groups // total, max_groups - 1)
+            lookup[code] = group
+            groups[group].append(levels[code])
+            seen += counts[code]
+
+        # Trailing -1 maps missing values (code -1) to -1
+        lookup.append(-1)
+        if HAS_NUMPY:
+            return np.asarray(lookup, dtype=np.int64)[codes], groups
+        return [lookup[code] for code in codes], groups
+
+    def importance(self, metric: str = "success_rate") -> dict:
+        """Functional ANOVA of a metric over the swept parameters.
+
+        Returns the share of variance explained by each parameter alone
+        (main effects) and by each pair beyond their main effects
+        (interactions), plus the parameter groups used and each group's mean.
+        Each share is corrected for what run-to-run noise alone would explain
+        with that many groups; the noise level is the variance left over by
+        the additive (main effects only) model. Interactions are None when
+        there are too few runs to estimate the noise.
+        """
+        values = getattr(self, metric)
+        finite = _finite(values)
+        grand = sum(finite) / len(finite) if finite else 0.0
+        total_ss = sum((v - grand) ** 2 for v in finite)
+        grouped = {param: self.importance_groups(param) for param in self.codes}
+
+        between = {param: _between_ss(codes, values, len(groups))
+                   for param, (codes, groups) in grouped.items()}
+        residual_df = len(finite) - 1 - sum(k - 1 for _, k in between.values())
+        noise = (max(0.0, total_ss - sum(ss for ss, _ in between.values())) / residual_df
+                 if residual_df > 0 else None)
+
+        def share(ss: float, df: int) -> float:
+            if total_ss == 0:
+                return 0.0
+            return max(0.0, (ss - df * (noise or 0.0)) / total_ss)
+
+        main = {param: share(ss, k - 1) for param, (ss, k) in between.items()}
+
+        interactions = {}
+        for param_a, param_b in itertools.combinations(grouped, 2):
+            if noise is None:
+                interactions[(param_a, param_b)] = None
+                continue
+            (codes_a, groups_a), (codes_b, groups_b) = grouped[param_a], grouped[param_b]
+            if HAS_NUMPY:
+                codes = np.where((codes_a >= 0) & (codes_b >= 0),
+                                 codes_a * len(groups_b) + codes_b, -1)
+            else:
+                codes = [a * len(groups_b) + b if a >= 0 and b >= 0 else -1
+                         for a, b in zip(codes_a, codes_b)]
+            joint_ss, cells = _between_ss(codes, values, len(groups_a) * len(groups_b))
+            (ss_a, k_a), (ss_b, k_b) = between[param_a], between[param_b]
+            interactions[(param_a, param_b)] = share(joint_ss - ss_a - ss_b,
+                                                     max(0, cells - k_a - k_b + 1))
+
+        group_means = {}
+        for param, (codes, groups) in grouped.items():
+            sums, counts = _group_sums(codes, values, len(groups))
+            group_means[param] = [(group, s / c) for group, s, c in zip(groups, sums, counts) if c]
+
+        return {"metric": metric, "main": main, "interactions": interactions,
+                "groups": group_means}
+
+    def fastest_to_solve(self) -> Optional[tuple[int, float]]:
+        """Row index and estimated seconds of the run quickest to its first success."""
+        if HAS_NUMPY:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                times = self.first_success / self.episodes_per_sec
+            times[(self.first_success < 0) | ~np.isfinite(times)] = np.nan
+            if np.isnan(times).all():
+                return None
+            best = int(np.nanargmin(times))
+            return best, float(times[best])
+
+        solve_times = [(t, i) for i, r in enumerate(self.results)
+                       if (t := time_to_first_success(r)) is not None]
+        if not solve_times:
+            return None
+        best_time, best = min(solve_times)
+        return best, best_time
+
+
+def _level_sort_key(value):
+    """Sort parameter values numerically where possible (CSV values are strings)."""
+    try:
+        return (0, float(value), "")
+    except (TypeError, ValueError):
+        return (1, 0.0, str(value))
+
+
+def _group_label(group: list):
+    """A parameter group's value, or "low..high" for a bin of several values."""
+    if len(group) == 1:
+        return group[0]
+    values = sorted(group, key=_level_sort_key)
+    return f"{float(values[0]):.3g}..{float(values[-1]):.3g}"
+
+
 def analyze_parameter_impact(results: list[dict], param: str) -> dict:
     """Analyze how a parameter affects performance."""
-    value_metrics = {}
+    return ResultTable(results, [param]).marginal_means(param)
+
+
+def analyze_importance(table: ResultTable) -> dict:
+    """Parameter importance on success rate, or mean reward if success never varies."""
+    if len(set(_finite(table.success_rate))) > 1:
+        return table.importance("success_rate")
+    return table.importance("mean_reward")
+
+
+def suggest_config(config: dict, importance: dict, best: dict,
+                   threshold: float = IMPORTANCE_THRESHOLD) -> dict:
+    """Reduced search space for a follow-up sweep.
+
+    Parameters whose total effect (main effect plus their interactions)
+    explains less than ``threshold`` of the variance are fixed at the best
+    run's value. The others keep only their better half of values (or bins,
+    narrowing a range to the values seen in them). Constant parameters pass
+    through unchanged, as does the rest of the config (e.g. its asha block).
+    """
+    best_params = best.get("params", best)
+    parameters = {}
 
-    for r in results:
-        params = r.get("params", r)
-        if param not in params:
+    total_effect = dict(importance["main"])
+    for pair, share in importance["interactions"].items():
+        for param in pair:
+            total_effect[param] += share or 0.0
+
+    for param, spec in config.get("parameters", {}).items():
+        if not isinstance(spec, (list, dict)):
+            parameters[param] = spec
+            continue
+        share = total_effect.get(param)
+        groups = importance["groups"].get(param, [])
+        if share is not None and share < threshold and param in best_params:
+            # Prefer the config's own value (summary.csv values are strings)
+            best_value = best_params[param]
+            if isinstance(spec, list):
+                best_value = next((v for v in spec
+                                   if _level_sort_key(v) == _level_sort_key(best_value)), best_value)
+            elif isinstance(best_value, str):
+                best_value = float(best_value)
+            parameters[param] = [best_value]
+            continue
+        if len(groups) < 2:
+            parameters[param] = spec
             continue
 
-        value = params[param]
-        if value not in value_metrics:
-            value_metrics[value] = {"success_rates": [], "mean_rewards": []}
+        ranked = sorted(groups, key=lambda g: g[1], reverse=True)
+        kept = [value for group, _ in ranked[:math.ceil(len(ranked) / 2)] for value in group]
 
-        success_rate = float(r.get("success_rate", 0))
-        mean_reward = float(r.get("mean_reward", 0))
+        if isinstance(spec, list):
+            kept_keys = {_level_sort_key(value) for value in kept}
+            parameters[param] = [v for v in spec if _level_sort_key(v) in kept_keys]
+        else:
+            numbers = [float(value) for value in kept]
+            parameters[param] = {"min": min(numbers), "max": max(numbers),
+                                 "log": spec.get("log", False)}
 
-        value_metrics[value]["success_rates"].append(success_rate)
-        value_metrics[value]["mean_rewards"].append(mean_reward)
+    sweep_type = config.get("type", "grid")
+    if sweep_type == "grid" and any(isinstance(spec, dict) for spec in parameters.values()):
+        sweep_type = "random"
 
-    # Compute averages
-    analysis = {}
-    for value, metrics in value_metrics.items():
-        analysis[value] = {
-            "avg_success_rate": sum(metrics["success_rates"]) / len(metrics["success_rates"]),
-            "avg_mean_reward": sum(metrics["mean_rewards"]) / len(metrics["mean_rewards"]),
-            "n_runs": len(metrics["success_rates"])
-        }
+    suggested = {**config, "name": f"{config.get('name', 'sweep')}_refined",
+                 "type": sweep_type, "parameters": parameters}
+    if sweep_type in ("random", "asha", "bayes"):
+        suggested.setdefault("n_samples", 10)
+    return suggested
+
+
+def format_importance(importance: dict, suggested: Optional[dict] = None):
+    """Print the importance report and, if given, the suggested search space."""
+    metric = importance["metric"].replace("_", " ")
+    print(f"\n{'='*70}")
+    print(f"PARAMETER IMPORTANCE (functional ANOVA on {metric})")
+    print(f"{'='*70}")
+    if importance.get("partial_runs_excluded"):
+        print(f"\n({importance['partial_runs_excluded']} runs stopped early are excluded; "
+              f"only full-length runs are used)")
+    elif importance.get("partial_runs_included"):
+        print(f"\n(No run finished its full budget: all {importance['partial_runs_included']} runs "
+              f"were stopped early and report partial-budget metrics)")
+
+    explained = 0.0
+    print("\nMain effects (share of variance):")
+    for param, share in sorted(importance["main"].items(), key=lambda x: x[1], reverse=True):
+        explained += share
+        print(f"  {param:<26} {share:>6.1%}  {'#' * round(share * 40)}")
+
+    if importance["interactions"]:
+        print("\nPairwise interactions (beyond main effects):")
+        unmeasured = 0
+        for (param_a, param_b), share in sorted(importance["interactions"].items(),
+                                                key=lambda x: -1 if x[1] is None else x[1],
+                                                reverse=True):
+            if share is None:
+                unmeasured += 1
+                continue
+            explained += share
+            print(f"  {param_a + ' x ' + param_b:<40} {share:>6.1%}")
+        if unmeasured:
+            print(f"  ({unmeasured} pairs not measurable: too few runs to estimate noise)")
+
+    print(f"\n  Unexplained (noise, higher-order effects): {max(0.0, 1 - explained):.1%}")
 
-    return analysis
+    if suggested:
+        print(f"\nSuggested reduced search space ({suggested['type']}):")
+        for param, spec in suggested["parameters"].items():
+            fixed = " (fixed)" if isinstance(spec, list) and len(spec) == 1 else ""
+            print(f"  {param}: {spec}{fixed}")
 
 
-def format_analysis(config: dict, results: list[dict], top_n: int = 5):
+def format_analysis(config: dict, results: list[dict], top_n: int = 5,
+                    interactions: bool = False, importance: Optional[dict] = None,
+                    suggested: Optional[dict] = None):
     """Format analysis output."""
     print("=" * 70)
     print(f"SWEEP ANALYSIS: {config.get('name', 'Unknown')}")
@@ -85,41 +497,52 @@ def format_analysis(config: dict, results: list[dict], top_n: int = 5):
         print("\nNo results found.")
         return
 
+    # Load everything into columns once
+    parameters = config.get("parameters", {})
+    table = ResultTable(results, parameters)
+
     # Sort by success rate
-    sorted_results = sorted(
-        results,
-        key=lambda x: float(x.get("success_rate", 0)),
-        reverse=True
-    )
+    ranking = table.ranking()
 
     # Top configurations
     print(f"\n{'='*70}")
-    print(f"TOP {min(top_n, len(sorted_results))} CONFIGURATIONS")
+    print(f"TOP {min(top_n, len(ranking))} CONFIGURATIONS")
     print(f"{'='*70}")
 
-    for i, r in enumerate(sorted_results[:top_n], 1):
+    for i, r in enumerate((results[row] for row in ranking[:top_n]), 1):
         params = r.get("params", {k: v for k, v in r.items()
                                    if k not in ["run_id", "success", "success_rate",
                                                "mean_reward", "max_reward",
-                                               "episodes_to_first_success"]})
+                                               "episodes_to_first_success",
+                                               "episodes_trained",
+                                               *RESOURCE_COLUMNS]})
         print(f"\n#{i} (Run {r.get('run_id', '?')})")
         print(f"  Success rate: {float(r.get('success_rate', 0)):.1%}")
         print(f"  Mean reward: {float(r.get('mean_reward', 0)):.1f}")
         print(f"  Max reward: {float(r.get('max_reward', 0)):.1f}")
         print(f"  First success: Episode {r.get('episodes_to_first_success', 'N/A')}")
+        if r.get("episodes_trained"):
+            print(f"  Stopped early after: {r['episodes_trained']} episodes")
+        if metric_value(r, "wall_time_s") is not None:
+            cpu_time = (metric_value(r, "cpu_user_s") or 0) + (metric_value(r, "cpu_sys_s") or 0)
+            print(f"  Cost: {metric_value(r, 'wall_time_s'):.0f}s wall, {cpu_time:.0f}s CPU, "
+                  f"{metric_value(r, 'peak_rss_mb') or 0:.0f} MB peak RSS, "
+                  f"{metric_value(r, 'episodes_per_sec') or 0:.1f} episodes/s")
+        solve_time = time_to_first_success(r)
+        if solve_time is not None:
+            print(f"  Time to first success: ~{solve_time:.0f}s")
         print(f"  Parameters:")
         for k, v in params.items():
             print(f"    {k}: {v}")
 
     # Parameter impact analysis
-    parameters = config.get("parameters", {})
     if parameters:
         print(f"\n{'='*70}")
         print("PARAMETER IMPACT ANALYSIS")
         print(f"{'='*70}")
 
         for param in parameters:
-            analysis = analyze_parameter_impact(results, param)
+            analysis = table.marginal_means(param)
             if not analysis:
                 continue
 
@@ -128,13 +551,39 @@ def format_analysis(config: dict, results: list[dict], top_n: int = 5):
                                    key=lambda x: x[1]["avg_success_rate"],
                                    reverse=True)
             for value, metrics in sorted_values:
+                wall_time = (f", avg wall: {metrics['avg_wall_time']:.0f}s"
+                             if metrics["avg_wall_time"] is not None else "")
                 print(f"  {value}: {metrics['avg_success_rate']:.1%} success "
-                      f"(avg reward: {metrics['avg_mean_reward']:.1f}, "
+                      f"(avg reward: {metrics['avg_mean_reward']:.1f}{wall_time}, "
                       f"n={metrics['n_runs']})")
 
+    if interactions and len(parameters) > 1:
+        print(f"\n{'='*70}")
+        print("PARAMETER INTERACTIONS (avg success rate)")
+        print(f"{'='*70}")
+
+        for param_a, param_b in itertools.combinations(parameters, 2):
+            cells = table.interaction_table(param_a, param_b)
+            if not cells:
+                continue
+            levels_a = table.group_labels(param_a)
+            levels_b = table.group_labels(param_b)
+            # Binned ranges have longer labels than single values
+            label_width = max(12, *(len(str(a)) for a in levels_a))
+            width = max(10, *(len(str(b)) for b in levels_b))
+            print(f"\n{param_a} (rows) x {param_b} (columns):")
+            print(f"  {'':>{label_width}} " + " ".join(f"{str(b):>{width}}" for b in levels_b))
+            for a in levels_a:
+                row = [f"{cells[(a, b)]['avg_success_rate']:>{width}.1%}" if (a, b) in cells
+                       else f"{'-':>{width}}" for b in levels_b]
+                print(f"  {str(a):>{label_width}} " + " ".join(row))
+
+    if importance:
+        format_importance(importance, suggested)
+
     # Overall statistics
-    success_rates = [float(r.get("success_rate", 0)) for r in results]
-    mean_rewards = [float(r.get("mean_reward", 0)) for r in results]
+    success_rates = _finite(table.success_rate)
+    mean_rewards = _finite(table.mean_reward)
 
     print(f"\n{'='*70}")
     print("OVERALL STATISTICS")
@@ -144,8 +593,22 @@ def format_analysis(config: dict, results: list[dict], top_n: int = 5):
     print(f"  Avg success rate: {sum(success_rates)/len(success_rates):.1%}")
     print(f"  Avg mean reward: {sum(mean_rewards)/len(mean_rewards):.1f}")
 
+    wall_times = _finite(table.wall_time)
+    if wall_times:
+        peak_rss = _finite(table.peak_rss)
+        print(f"  Total compute: {sum(wall_times) / 3600:.2f} run-hours "
+              f"(avg {sum(wall_times) / len(wall_times):.0f}s per run)")
+        if peak_rss:
+            print(f"  Peak RSS range: {min(peak_rss):.0f} - {max(peak_rss):.0f} MB")
+
+    fastest = table.fastest_to_solve()
+    if fastest is not None:
+        row, fastest_time = fastest
+        print(f"  Fastest to first success: Run {results[row].get('run_id', '?')} "
+              f"(~{fastest_time:.0f}s)")
+
     # Recommendations
-    best = sorted_results[0] if sorted_results else None
+    best = results[ranking[0]] if ranking else None
     if best:
         print(f"\n{'='*70}")
         print("RECOMMENDATION")
@@ -157,11 +620,245 @@ def format_analysis(config: dict, results: list[dict], top_n: int = 5):
             print(f"  {k} = {v}")
 
 
+def expected_runs(config: dict) -> Optional[int]:
+    """Number of runs a sweep config will produce, if known up front."""
+    if config.get("type", "grid") != "grid":
+        return config.get("n_samples", 10)
+    total = 1
+    for values in config.get("parameters", {}).values():
+        if not isinstance(values, list):
+            return None
+        total *= len(values)
+    if config.get("shard"):
+        k, n = (int(part) for part in config["shard"].split("/"))
+        return len(range(k - 1, total, n))
+    return total
+
+
+class ResultFollower:
+    """Picks up results a running sweep has written since the last poll.
+
+    Reads only the bytes appended to results.jsonl since the previous poll
+    (a trailing partial line is kept for the next one) and only new files in
+    a work queue's done/ directory. A poll that finds nothing changed costs
+    one stat() per source.
+    """
+
+    def __init__(self, results_dir: Path):
+        self.results_path = results_dir / "results.jsonl"
+        self.done_dir = results_dir / "done"
+        self.offset = 0
+        self.partial = b""
+        self.last_stat = None
+        self.done_seen = set()
+        self.done_mtime = None
+
+    def poll(self) -> list[dict]:
+        """New result records, in the order they were written."""
+        return self._poll_jsonl() + self._poll_done()
+
+    def _poll_jsonl(self) -> list[dict]:
+        try:
+            stat = os.stat(self.results_path)
+        except FileNotFoundError:
+            return []
+        if (stat.st_ino, stat.st_size, stat.st_mtime_ns) == self.last_stat:
+            return []
+        if self.last_stat and (stat.st_ino != self.last_stat[0] or stat.st_size < self.offset):
+            # Rewritten in place (write_results); re-read it, duplicates replace
+            self.offset, self.partial = 0, b""
+        self.last_stat = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+        with open(self.results_path, "rb") as f:
+            f.seek(self.offset)
+            data = f.read()
+        self.offset += len(data)
+        lines = (self.partial + data).split(b"\n")
+        self.partial = lines.pop()
+
+        results = []
+        for line in lines:
+            try:
+                results.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+        return results
+
+    def _poll_done(self) -> list[dict]:
+        try:
+            mtime = os.stat(self.done_dir).st_mtime_ns
+        except FileNotFoundError:
+            return []
+        if mtime == self.done_mtime:
+            return []
+        self.done_mtime = mtime
+
+        results = []
+        for name in sorted(os.listdir(self.done_dir)):
+            if name.startswith(".") or not name.endswith(".json") or name in self.done_seen:
+                continue
+            try:
+                with open(self.done_dir / name) as f:
+                    results.append(json.load(f))
+            except (OSError, json.JSONDecodeError):
+                continue
+            self.done_seen.add(name)
+        return results
+
+
+class LiveSummary:
+    """Running aggregates over a sweep's results, updated one run at a time.
+
+    Keeps the ranking as a sorted list (bisect insert) and per-parameter
+    value sums, so each finished run costs O(log n + parameters) and a
+    re-recorded run (from --resume) replaces its earlier record.
+    """
+
+    def __init__(self, parameters):
+        self.parameters = list(parameters)
+        self.by_run = {}
+        self.ranked = []
+        self.impact = {param: {} for param in self.parameters}
+        self.wall_time = 0.0
+        self.wall_runs = 0
+        self.episodes_per_sec = 0.0
+
+    @staticmethod
+    def _rank_key(result: dict) -> tuple:
+        # Sorted ascending: full-length runs first, then by success rate
+        return (1 if result.get("episodes_trained") else 0,
+                -float(result.get("success_rate") or 0), result.get("run_id") or 0)
+
+    def _apply(self, result: dict, sign: int):
+        params = result.get("params", result)
+        success = float(result.get("success_rate") or 0)
+        reward = float(result.get("mean_reward") or 0)
+        for param in self.parameters:
+            if param in params:
+                sums = self.impact[param].setdefault(params[param], [0.0, 0.0, 0])
+                sums[0] += sign * success
+                sums[1] += sign * reward
+                sums[2] += sign
+        wall_time = metric_value(result, "wall_time_s")
+        if wall_time is not None:
+            self.wall_time += sign * wall_time
+            self.wall_runs += sign
+            self.episodes_per_sec += sign * (metric_value(result, "episodes_per_sec") or 0)
+
+    def add(self, result: dict):
+        """Fold one finished run into the aggregates."""
+        run_id = result.get("run_id")
+        old = self.by_run.get(run_id)
+        if old is not None:
+            self._apply(old, -1)
+            del self.ranked[bisect.bisect_left(self.ranked, (self._rank_key(old), run_id))]
+        self.by_run[run_id] = result
+        self._apply(result, 1)
+        bisect.insort(self.ranked, (self._rank_key(result), run_id))
+
+    def top(self, n: int) -> list[dict]:
+        return [self.by_run[run_id] for _, run_id in self.ranked[:n]]
+
+
+def format_live(config: dict, live: LiveSummary, top_n: int, runs_per_hour: Optional[float]):
+    """Print the live dashboard for a running sweep."""
+    done = len(live.by_run)
+    total = expected_runs(config)
+
+    print("=" * 70)
+    print(f"LIVE SWEEP: {config.get('name', 'Unknown')}  ({time.strftime('%H:%M:%S')})")
+    print("=" * 70)
+    progress = f"{done}/{total} runs ({done / total:.0%})" if total else f"{done} runs"
+    print(f"\nProgress: {progress}")
+    if runs_per_hour:
+        eta = ""
+        if total and total > done:
+            eta = f", ETA ~{(total - done) / runs_per_hour:.1f}h"
+        print(f"Throughput: {runs_per_hour:.1f} runs/hour{eta}")
+    if live.wall_runs:
+        print(f"Avg run: {live.wall_time / live.wall_runs:.0f}s wall, "
+              f"{live.episodes_per_sec / live.wall_runs:.1f} episodes/s")
+
+    if not done:
+        print("\nWaiting for the first run to finish...")
+        return
+
+    print(f"\nTOP {min(top_n, done)} CONFIGURATIONS")
+    print("-" * 70)
+    for i, r in enumerate(live.top(top_n), 1):
+        params = ", ".join(f"{k}={v}" for k, v in r.get("params", {}).items())
+        stopped = f" (stopped at {r['episodes_trained']})" if r.get("episodes_trained") else ""
+        print(f"  #{i} Run {r.get('run_id', '?')}: {float(r.get('success_rate', 0)):.1%} success, "
+              f"reward {float(r.get('mean_reward', 0)):.1f}{stopped}  {params}")
+
+    if live.parameters:
+        print(f"\nPARAMETER IMPACT (avg success rate)")
+        print("-" * 70)
+        for param in live.parameters:
+            values = [(value, sums[0] / sums[2], sums[2])
+                      for value, sums in live.impact[param].items() if sums[2]]
+            values.sort(key=lambda x: x[1], reverse=True)
+            print(f"  {param}: " + ", ".join(f"{value}={rate:.0%} (n={n})"
+                                             for value, rate, n in values))
+
+
+def follow(results_dir: Path, config: dict, top_n: int = 5, interval: float = 10.0) -> int:
+    """Refresh a dashboard as runs finish, until the sweep completes or Ctrl-C."""
+    follower = ResultFollower(results_dir)
+    live = LiveSummary(config.get("parameters", {}))
+    total = expected_runs(config)
+    config_path = results_dir / "sweep_config.json"
+    started = os.stat(config_path).st_mtime if config_path.exists() else time.time()
+
+    # Arrival times of runs seen finishing while following; the first poll
+    # only loads the backlog
+    arrivals = deque(maxlen=50)
+    first_poll = True
+
+    try:
+        while True:
+            new = follower.poll()
+            for result in new:
+                live.add(result)
+            if new and not first_poll:
+                arrivals.extend([time.time()] * len(new))
+
+            if new or first_poll:
+                if len(arrivals) >= 2 and arrivals[-1] > arrivals[0]:
+                    runs_per_hour = (len(arrivals) - 1) / (arrivals[-1] - arrivals[0]) * 3600
+                elif live.by_run and time.time() > started:
+                    runs_per_hour = len(live.by_run) / (time.time() - started) * 3600
+                else:
+                    runs_per_hour = None
+                if sys.stdout.isatty():
+                    print("\033[H\033[J", end="")
+                format_live(config, live, top_n, runs_per_hour)
+                sys.stdout.flush()
+            first_poll = False
+
+            if total and len(live.by_run) >= total:
+                print("\nSweep complete.")
+                return 0
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        return 0
+
+
 def main():
     parser = argparse.ArgumentParser(description="Analyze sweep results")
     parser.add_argument("results_dir", help="Path to sweep results directory")
     parser.add_argument("--top", type=int, default=5, help="Show top N configurations")
     parser.add_argument("--json", action="store_true", help="Output as JSON")
+    parser.add_argument("--interactions", action="store_true",
+                        help="Show pairwise parameter interaction tables")
+    parser.add_argument("--importance", action="store_true",
+                        help="Rank parameters and interactions by variance explained (fANOVA)")
+    parser.add_argument("--suggest-config", metavar="PATH",
+                        help="Write a reduced follow-up sweep config (implies --importance)")
+    parser.add_argument("--follow", action="store_true",
+                        help="Keep watching a running sweep and refresh as runs finish")
+    parser.add_argument("--interval", type=float, default=10.0,
+                        help="Seconds between checks in --follow mode")
     args = parser.parse_args()
 
     results_dir = Path(args.results_dir)
@@ -169,18 +866,53 @@ def main():
         print(f"Error: Directory not found: {results_dir}")
         return 1
 
+    if args.follow:
+        config = {}
+        if (results_dir / "sweep_config.json").exists():
+            with open(results_dir / "sweep_config.json") as f:
+                config = json.load(f)
+        return follow(results_dir, config, args.top, args.interval)
+
     config, results = load_results(results_dir)
 
+    importance = suggested = None
+    if (args.importance or args.suggest_config) and results:
+        # Runs ASHA stopped early report metrics from a partial budget, so
+        # fit and suggest from the full-length runs whenever there are any
+        full_length = [r for r in results if not r.get("episodes_trained")]
+        fitted = full_length or results
+        table = ResultTable(fitted, config.get("parameters", {}))
+        importance = analyze_importance(table)
+        importance["partial_runs_excluded"] = len(results) - len(fitted)
+        importance["partial_runs_included"] = 0 if full_length else len(results)
+        suggested = suggest_config(config, importance, fitted[table.ranking()[0]])
+
     if args.json:
         output = {
             "config": config,
             "results": results,
-            "best": sorted(results, key=lambda x: float(x.get("success_rate", 0)),
-                          reverse=True)[:args.top]
+            "best": [results[row] for row in ResultTable(results, []).ranking()[:args.top]]
         }
+        if importance:
+            output["importance"] = {
+                "metric": importance["metric"],
+                "main": importance["main"],
+                "partial_runs_excluded": importance["partial_runs_excluded"],
+                "partial_runs_included": importance["partial_runs_included"],
+                "interactions": {f"{a} x {b}": share
+                                 for (a, b), share in importance["interactions"].items()},
+            }
+            output["suggested_config"] = suggested
         print(json.dumps(output, indent=2))
     else:
-        format_analysis(config, results, args.top)
+        format_analysis(config, results, args.top, args.interactions, importance, suggested)
+
+    if args.suggest_config and suggested:
+        with open(args.suggest_config, "w") as f:
+            json.dump(suggested, f, indent=2)
+        if not args.json:
+            print(f"\nSuggested config saved to: {args.suggest_config}")
+            print(f"To run: python sweep_runner.py {args.suggest_config}")
 
     return 0
 
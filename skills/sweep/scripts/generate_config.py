@@ -83,7 +83,7 @@ def create_quick_config(name: str, params: dict, sweep_type: str = "grid",
         "parameters": params
     }
 
-    if sweep_type == "random":
+    if sweep_type in ("random", "asha", "bayes"):
         config["n_samples"] = n_samples
 
     return config
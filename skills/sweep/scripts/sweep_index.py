@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Cross-Sweep Results Index
+
+Ingest every sweep directory into a single SQLite index and query runs
+across all sweeps without re-parsing their JSON files.
+
+Usage:
+    python sweep_index.py ingest sweep_results/
+    python sweep_index.py query --where "actor_lr<1e-3" --top 10
+    python sweep_index.py query --where "batch_size=128" --where "success_rate>=0.5" --sweep lr_sweep
+    python sweep_index.py query --include-stopped --sort episodes_per_sec
+"""
+
+import argparse
+import json
+import re
+import sqlite3
+import time
+from pathlib import Path
+
+from analyze_results import load_results
+
+
+DEFAULT_DB = "sweep_results/sweep_index.db"
+
+# Files whose modification time tells whether a sweep changed since ingestion
+SWEEP_FILES = ["sweep_config.json", "results.jsonl", "results.json", "summary.csv"]
+
+# Per-run metrics stored as columns of the runs table. episodes_trained is
+# only set for runs stopped early (e.g. by ASHA), NULL for full-budget runs.
+METRIC_COLUMNS = [
+    "success_rate", "mean_reward", "max_reward", "episodes_to_first_success",
+    "episodes_trained", "wall_time_s", "cpu_user_s", "cpu_sys_s", "peak_rss_mb",
+    "episodes_per_sec",
+]
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS sweeps (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    name TEXT,
+    type TEXT,
+    episodes_per_run INTEGER,
+    mtime REAL NOT NULL,
+    n_runs INTEGER
+);
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    sweep_id INTEGER NOT NULL REFERENCES sweeps(id) ON DELETE CASCADE,
+    run_id INTEGER,
+    {", ".join(f"{column} REAL" for column in METRIC_COLUMNS)},
+    params TEXT
+);
+CREATE TABLE IF NOT EXISTS params (
+    run INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    key TEXT NOT NULL,
+    num REAL,
+    text TEXT
+);
+CREATE INDEX IF NOT EXISTS params_key_num ON params(key, num);
+CREATE INDEX IF NOT EXISTS params_key_text ON params(key, text);
+CREATE INDEX IF NOT EXISTS runs_sweep ON runs(sweep_id);
+CREATE INDEX IF NOT EXISTS runs_success ON runs(success_rate);
+"""
+
+CONDITION_PATTERN = re.compile(r"^\s*(\w+)\s*(<=|>=|!=|==|=|<|>)\s*(.+?)\s*$")
+
+
+def connect(db_path: Path) -> sqlite3.Connection:
+    """Open the index database, creating the schema if needed."""
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.executescript(SCHEMA)
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(runs)")}
+    if not columns.issuperset(METRIC_COLUMNS):
+        # Index built before these columns existed: it only caches the sweep
+        # directories, so start it over and let the next ingest reload them
+        conn.executescript("DROP TABLE params; DROP TABLE runs; DROP TABLE sweeps;")
+        conn.executescript(SCHEMA)
+    return conn
+
+
+def as_number(value) -> float | None:
+    """Value as a float, or None if it isn't numeric."""
+    if isinstance(value, bool):
+        return float(value)
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def sweep_mtime(sweep_dir: Path) -> float:
+    """Latest modification time of the files that make up a sweep's results."""
+    return max((sweep_dir / name).stat().st_mtime
+               for name in SWEEP_FILES if (sweep_dir / name).exists())
+
+
+def find_sweep_dirs(root: Path) -> list[Path]:
+    """All sweep directories (those holding a sweep_config.json) under root."""
+    return sorted(path.parent for path in root.rglob("sweep_config.json"))
+
+
+def ingest_sweep(conn: sqlite3.Connection, sweep_dir: Path, mtime: float) -> int:
+    """(Re)load one sweep directory into the index; returns the number of runs."""
+    config, results = load_results(sweep_dir)
+    param_names = list(config.get("parameters", {}))
+
+    conn.execute("DELETE FROM sweeps WHERE path = ?", (str(sweep_dir),))
+    sweep_id = conn.execute(
+        "INSERT INTO sweeps (path, name, type, episodes_per_run, mtime, n_runs) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        (str(sweep_dir), config.get("name"), config.get("type"),
+         config.get("episodes_per_run"), mtime, len(results)),
+    ).lastrowid
+
+    for r in results:
+        # summary.csv rows hold parameters and metrics side by side
+        params = r.get("params") or {k: r[k] for k in param_names if k in r}
+        run = conn.execute(
+            f"INSERT INTO runs (sweep_id, run_id, {', '.join(METRIC_COLUMNS)}, params) "
+            f"VALUES (?, ?, {', '.join('?' for _ in METRIC_COLUMNS)}, ?)",
+            (sweep_id, as_number(r.get("run_id")),
+             *(as_number(r.get(column)) for column in METRIC_COLUMNS),
+             json.dumps(params)),
+        ).lastrowid
+        conn.executemany(
+            "INSERT INTO params (run, key, num, text) VALUES (?, ?, ?, ?)",
+            [(run, key, as_number(value), str(value)) for key, value in params.items()],
+        )
+
+    return len(results)
+
+
+def ingest(conn: sqlite3.Connection, root: Path) -> dict:
+    """Bring the index up to date with every sweep under root.
+
+    Sweeps whose files haven't changed since the last ingestion are skipped;
+    sweeps that no longer exist are dropped.
+    """
+    indexed = dict(conn.execute("SELECT path, mtime FROM sweeps"))
+    stats = {"added": 0, "updated": 0, "unchanged": 0, "removed": 0, "runs": 0}
+
+    seen = set()
+    for sweep_dir in find_sweep_dirs(root.resolve()):
+        path = str(sweep_dir)
+        seen.add(path)
+        mtime = sweep_mtime(sweep_dir)
+        if indexed.get(path) == mtime:
+            stats["unchanged"] += 1
+            continue
+
+        stats["updated" if path in indexed else "added"] += 1
+        stats["runs"] += ingest_sweep(conn, sweep_dir, mtime)
+
+    root = root.resolve()
+    for path in indexed:
+        if Path(path).is_relative_to(root) and path not in seen:
+            conn.execute("DELETE FROM sweeps WHERE path = ?", (path,))
+            stats["removed"] += 1
+
+    conn.commit()
+    return stats
+
+
+def build_query(conditions: list[str], sweep: str | None, sort: str, top: int,
+                include_stopped: bool = False) -> tuple[str, list]:
+    """Translate "key<op>value" conditions into SQL over the index.
+
+    Runs stopped early are left out unless include_stopped is set: their
+    metrics cover only part of the budget, so they don't rank fairly
+    against full-length runs.
+    """
+    clauses = [] if include_stopped else ["runs.episodes_trained IS NULL"]
+    args = []
+
+    for condition in conditions:
+        match = CONDITION_PATTERN.match(condition)
+        if not match:
+            raise ValueError(f"Invalid condition '{condition}', expected e.g. actor_lr<1e-3")
+        key, op, value = match.groups()
+        op = "=" if op == "==" else op
+        number = as_number(value)
+
+        if key in METRIC_COLUMNS:
+            if number is None:
+                raise ValueError(f"Metric '{key}' needs a numeric value")
+            clauses.append(f"runs.{key} {op} ?")
+            args.append(number)
+        else:
+            # Uncorrelated subqueries are materialised once from the
+            # (key, value) indexes, leaving a set lookup per candidate run
+            column = "text" if number is None else "num"
+            clauses.append(f"runs.id IN (SELECT run FROM params WHERE key = ? AND {column} {op} ?)")
+            args.extend([key, value if number is None else number])
+
+    if sweep:
+        clauses.append("sweeps.name = ?")
+        args.append(sweep)
+
+    if sort not in METRIC_COLUMNS:
+        raise ValueError(f"Can't sort by '{sort}', choose from: {', '.join(METRIC_COLUMNS)}")
+
+    sql = ("SELECT sweeps.name, sweeps.path, runs.run_id, "
+           f"{', '.join('runs.' + column for column in METRIC_COLUMNS)}, runs.params "
+           "FROM runs JOIN sweeps ON sweeps.id = runs.sweep_id")
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    sql += f" ORDER BY runs.{sort} DESC LIMIT ?"
+    args.append(top)
+    return sql, args
+
+
+def query(conn: sqlite3.Connection, conditions: list[str], sweep: str | None = None,
+          sort: str = "success_rate", top: int = 10, include_stopped: bool = False) -> list[dict]:
+    """Top runs across all indexed sweeps matching every condition."""
+    sql, args = build_query(conditions, sweep, sort, top, include_stopped)
+    rows = []
+    for row in conn.execute(sql, args):
+        name, path, run_id, *metrics, params = row
+        rows.append({
+            "sweep": name,
+            "path": path,
+            "run_id": int(run_id) if run_id is not None else None,
+            **dict(zip(METRIC_COLUMNS, metrics)),
+            "params": json.loads(params),
+        })
+    return rows
+
+
+def format_rows(rows: list[dict]) -> str:
+    """Format query results as a table."""
+    if not rows:
+        return "No matching runs."
+
+    output = []
+    output.append(f"{'#':>3} {'Sweep':<24} {'Run':>5} {'Success%':>9} {'Mean Rwd':>9}  Parameters")
+    output.append("-" * 90)
+    for i, row in enumerate(rows, 1):
+        params = ", ".join(f"{k}={v}" for k, v in row["params"].items())
+        stopped = f" (stopped at {row['episodes_trained']:.0f})" if row["episodes_trained"] else ""
+        output.append(
+            f"{i:>3} {str(row['sweep'])[:24]:<24} {row['run_id'] or '?':>5} "
+            f"{row['success_rate'] or 0:>8.1%} {row['mean_reward'] or 0:>9.1f}  {params}{stopped}"
+        )
+    return '\n'.join(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Index and query results across sweeps")
+    parser.add_argument("--db", default=DEFAULT_DB, help="Index database path")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    ingest_parser = subparsers.add_parser("ingest", help="Index new or changed sweep directories")
+    ingest_parser.add_argument("root", nargs="?", default="sweep_results",
+                               help="Directory containing sweep result directories")
+
+    query_parser = subparsers.add_parser("query", help="Query runs across all indexed sweeps")
+    query_parser.add_argument("--where", action="append", default=[],
+                              help="Condition like 'actor_lr<1e-3' (repeatable)")
+    query_parser.add_argument("--sweep", help="Only runs from sweeps with this name")
+    query_parser.add_argument("--sort", default="success_rate", help="Metric to rank by")
+    query_parser.add_argument("--top", type=int, default=10, help="Number of runs to show")
+    query_parser.add_argument("--include-stopped", action="store_true",
+                              help="Also rank runs stopped early (partial-budget metrics)")
+    query_parser.add_argument("--json", action="store_true", help="Output as JSON")
+    args = parser.parse_args()
+
+    conn = connect(Path(args.db))
+
+    if args.command == "ingest":
+        root = Path(args.root)
+        if not root.exists():
+            print(f"Error: Directory not found: {root}")
+            return 1
+        start = time.perf_counter()
+        stats = ingest(conn, root)
+        print(f"Indexed {args.db}: {stats['added']} added, {stats['updated']} updated, "
+              f"{stats['unchanged']} unchanged, {stats['removed']} removed "
+              f"({stats['runs']} runs loaded in {time.perf_counter() - start:.2f}s)")
+        return 0
+
+    start = time.perf_counter()
+    try:
+        rows = query(conn, args.where, args.sweep, args.sort, args.top, args.include_stopped)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    if args.json:
+        print(json.dumps(rows, indent=2))
+    else:
+        print(format_rows(rows))
+        print(f"\n{len(rows)} runs in {elapsed_ms:.1f} ms")
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
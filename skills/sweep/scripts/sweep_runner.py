@@ -7,68 +7,209 @@ Execute hyperparameter sweeps from a JSON configuration file.
 Usage:
     python sweep_runner.py sweep_config.json
     python sweep_runner.py sweep_config.json --dry-run
+    python sweep_runner.py sweep_config.json --workers 4
+    python sweep_runner.py --resume sweep_results/my_sweep_20240115_093000/
+    python sweep_runner.py sweep_config.json --shard 2/4
+    python sweep_runner.py sweep_config.json --queue /mnt/shared/my_sweep   # on each host
 """
 
 import argparse
+import hashlib
 import json
+import shutil
+import socket
 import itertools
+import math
+import os
+import queue
+import random
+import re
 import subprocess
 import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 import csv
 
 
+# Append-only record of finished runs, used by --resume
+LEDGER_FILE = "ledger.jsonl"
+# Append-only run results, one JSON object per line
+RESULTS_FILE = "results.jsonl"
+
+# Episode result lines, e.g. "Run 123 ✓ LANDED ... Reward: 245.3"
+EPISODE_PATTERN = re.compile(r"Run (\d+).*Reward: ([\d.-]+)")
+SUCCESS_REWARD = 200
+
+# Seconds before a training run is killed
+RUN_TIMEOUT = 3600
+
+# Per-run cost measurements recorded alongside the reward metrics
+RESOURCE_COLUMNS = ["wall_time_s", "cpu_user_s", "cpu_sys_s", "peak_rss_mb", "episodes_per_sec"]
+
+# Module launched for each run; its package sources version the result cache
+TRAINING_MODULE = "lunar-lander.main"
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "sweep_runner"
+
+
 def load_config(config_path: str) -> dict:
     """Load sweep configuration from JSON file."""
     with open(config_path) as f:
         return json.load(f)
 
 
-def generate_grid_combinations(parameters: dict) -> list[dict]:
+class GridSpace:
+    """Lazy, indexable view of all grid search combinations.
+
+    Nothing is materialised: ``len()`` is the product of the value counts and
+    ``grid[i]`` decodes index ``i`` in O(number of parameters), in the same
+    order as ``itertools.product`` (last parameter varies fastest).
+    """
+
+    def __init__(self, parameters: dict):
+        self.keys = list(parameters.keys())
+        self.values = list(parameters.values())
+
+    def __len__(self) -> int:
+        return math.prod(len(v) for v in self.values)
+
+    def __getitem__(self, index: int) -> dict:
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        combo = {}
+        for key, values in zip(reversed(self.keys), reversed(self.values)):
+            index, digit = divmod(index, len(values))
+            combo[key] = values[digit]
+        return {key: combo[key] for key in self.keys}
+
+    def __iter__(self):
+        for combo in itertools.product(*self.values):
+            yield dict(zip(self.keys, combo))
+
+
+def generate_grid_combinations(parameters: dict) -> GridSpace:
     """Generate all combinations for grid search."""
-    keys = list(parameters.keys())
-    values = list(parameters.values())
-    combinations = []
+    return GridSpace(parameters)
 
-    for combo in itertools.product(*values):
-        combinations.append(dict(zip(keys, combo)))
 
-    return combinations
+def parse_shard(shard: str) -> tuple[int, int]:
+    """Parse a "k/n" shard spec (1-based k)."""
+    try:
+        k, n = (int(part) for part in shard.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid shard '{shard}', expected k/n")
+    if not 1 <= k <= n:
+        raise argparse.ArgumentTypeError(f"invalid shard '{shard}', need 1 <= k <= n")
+    return k, n
 
 
-def generate_random_combinations(parameters: dict, n_samples: int) -> list[dict]:
+def shard_indices(total: int, shard: tuple[int, int] | None) -> range:
+    """Combination indices belonging to a shard (every n-th, from k-1)."""
+    if shard is None:
+        return range(total)
+    k, n = shard
+    return range(k - 1, total, n)
+
+
+def generate_random_combinations(parameters: dict, n_samples: int,
+                                 seed: int | None = None) -> list[dict]:
     """Generate random combinations for random search."""
-    import random
+    rng = random.Random(seed)
     combinations = []
 
     for _ in range(n_samples):
         combo = {}
         for key, value_spec in parameters.items():
             if isinstance(value_spec, list):
-                combo[key] = random.choice(value_spec)
+                combo[key] = rng.choice(value_spec)
             elif isinstance(value_spec, dict):
                 # Range specification: {"min": 0.001, "max": 0.01, "log": true}
                 min_val = value_spec["min"]
                 max_val = value_spec["max"]
                 if value_spec.get("log", False):
-                    import math
-                    combo[key] = math.exp(random.uniform(math.log(min_val), math.log(max_val)))
+                    combo[key] = math.exp(rng.uniform(math.log(min_val), math.log(max_val)))
                 else:
-                    combo[key] = random.uniform(min_val, max_val)
+                    combo[key] = rng.uniform(min_val, max_val)
+            else:
+                # A constant: every run gets the same value
+                combo[key] = value_spec
         combinations.append(combo)
 
     return combinations
 
 
-def run_training(params: dict, episodes: int, run_id: int, output_dir: Path) -> dict:
-    """Run a single training with given parameters."""
+# Thread-count variables pinned to 1 for parallel runs so that N concurrent
+# trainings don't each spawn a full set of BLAS/OpenMP threads.
+THREAD_ENV_VARS = [
+    "OMP_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+]
+
+
+def available_cpus() -> list[int]:
+    """List the CPUs this process may run on."""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def single_thread_env() -> dict:
+    """Environment for a training child limited to one math-library thread."""
+    env = os.environ.copy()
+    for var in THREAD_ENV_VARS:
+        env[var] = "1"
+    return env
+
+
+def wait_with_usage(proc: subprocess.Popen) -> tuple[int, dict]:
+    """Wait for a child and return its exit code and resource usage.
+
+    Usage comes from wait4() and covers only this child (CPU user/sys time
+    and peak RSS); on platforms without wait4() it is empty.
+    """
+    if not hasattr(os, "wait4"):
+        return proc.wait(), {}
+
+    try:
+        _, status, rusage = os.wait4(proc.pid, 0)
+    except ChildProcessError:
+        # Already reaped by Popen (e.g. a concurrent kill() polled it)
+        return proc.wait(), {}
+    proc.returncode = os.waitstatus_to_exitcode(status)
+
+    # ru_maxrss is in KiB on Linux but bytes on macOS
+    rss_bytes = rusage.ru_maxrss if sys.platform == "darwin" else rusage.ru_maxrss * 1024
+    return proc.returncode, {
+        "cpu_user_s": round(rusage.ru_utime, 3),
+        "cpu_sys_s": round(rusage.ru_stime, 3),
+        "peak_rss_mb": round(rss_bytes / (1024 * 1024), 1),
+    }
+
+
+def run_training(params: dict, episodes: int, run_id: int, output_dir: Path,
+                 cpu: int | None = None, on_episode=None) -> dict:
+    """Run a single training with given parameters.
+
+    The child's stdout is streamed line by line: each line is written
+    straight to stdout.txt and fed to a TrainingMetrics accumulator, so
+    memory stays constant however long the run is. ``on_episode``, if
+    given, is called with the live metrics after every episode line; if it
+    returns True the run is stopped early and marked ``stopped_early``.
+
+    If ``cpu`` is given, the child is pinned to that CPU (where the platform
+    supports it) and limited to a single math-library thread.
+    """
     run_dir = output_dir / f"run_{run_id:03d}"
     run_dir.mkdir(exist_ok=True)
 
     # Build command with parameter overrides
     cmd = [
-        sys.executable, "-m", "lunar-lander.main",
+        sys.executable, "-m", TRAINING_MODULE,
         "--episodes", str(episodes),
         "--output-dir", str(run_dir),
     ]
@@ -85,71 +226,146 @@ def run_training(params: dict, episodes: int, run_id: int, output_dir: Path) ->
     print(f"Run {run_id}: {params}")
     print(f"{'='*60}")
 
+    popen_kwargs = {}
+    if cpu is not None:
+        popen_kwargs["env"] = single_thread_env()
+
     try:
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=3600  # 1 hour timeout
-        )
+        metrics = TrainingMetrics()
 
-        # Save output
-        with open(run_dir / "stdout.txt", "w") as f:
-            f.write(result.stdout)
-        with open(run_dir / "stderr.txt", "w") as f:
-            f.write(result.stderr)
+        with open(run_dir / "stdout.txt", "w", encoding="utf-8", buffering=1) as stdout_file, \
+                open(run_dir / "stderr.txt", "w", encoding="utf-8") as stderr_file:
+            start = time.monotonic()
+            proc = subprocess.Popen(
+                cmd,
+                stdout=subprocess.PIPE,
+                stderr=stderr_file,
+                text=True,
+                encoding="utf-8",
+                errors="replace",
+                **popen_kwargs
+            )
+            if cpu is not None and hasattr(os, "sched_setaffinity"):
+                # Pinned from the parent: preexec_fn isn't safe from worker threads
+                try:
+                    os.sched_setaffinity(proc.pid, {cpu})
+                except OSError:
+                    pass  # Already exited, or the CPU is unavailable
 
-        # Parse results (extract final metrics from output)
-        metrics = parse_training_output(result.stdout)
-        metrics["params"] = params
-        metrics["run_id"] = run_id
-        metrics["success"] = result.returncode == 0
+            timed_out = threading.Event()
 
-        return metrics
+            def kill_on_timeout():
+                timed_out.set()
+                proc.kill()
+
+            timer = threading.Timer(RUN_TIMEOUT, kill_on_timeout)
+            timer.start()
+            stopped_early = False
+            try:
+                for line in proc.stdout:
+                    stdout_file.write(line)
+                    if metrics.update(line) and on_episode is not None:
+                        if on_episode(metrics):
+                            stopped_early = True
+                            proc.kill()
+                            break
+                returncode, usage = wait_with_usage(proc)
+            finally:
+                timer.cancel()
+                if proc.poll() is None:
+                    proc.kill()
+                    proc.wait()
+
+        if timed_out.is_set():
+            return {"params": params, "run_id": run_id, "success": False, "error": "timeout"}
+
+        wall_time = time.monotonic() - start
+        result = metrics.as_dict()
+        result["params"] = params
+        result["run_id"] = run_id
+        result["success"] = returncode == 0 or stopped_early
+        result["wall_time_s"] = round(wall_time, 3)
+        result["episodes_per_sec"] = round(metrics.total / wall_time, 3) if wall_time > 0 else 0.0
+        result.update(usage)
+        if stopped_early:
+            result["stopped_early"] = True
+            result["episodes_trained"] = metrics.total
+
+        return result
 
-    except subprocess.TimeoutExpired:
-        return {"params": params, "run_id": run_id, "success": False, "error": "timeout"}
     except Exception as e:
         return {"params": params, "run_id": run_id, "success": False, "error": str(e)}
 
 
-def parse_training_output(output: str) -> dict:
-    """Parse training output to extract metrics."""
-    import re
+@dataclass
+class TrainingMetrics:
+    """Metrics accumulated incrementally from training output lines."""
+    total: int = 0
+    successes: int = 0
+    reward_sum: float = 0.0
+    max_reward: float = -float("inf")
+    first_success: int = -1
+    last_episode: int = 0
 
-    metrics = {
-        "success_rate": 0.0,
-        "mean_reward": 0.0,
-        "max_reward": -float("inf"),
-        "episodes_to_first_success": -1,
-    }
+    def update(self, line: str) -> bool:
+        """Consume one output line; return True if it was an episode line."""
+        match = EPISODE_PATTERN.search(line)
+        if not match:
+            return False
 
-    successes = 0
-    total = 0
-    rewards = []
-    first_success = -1
+        episode = int(match.group(1))
+        reward = float(match.group(2))
+        self.total += 1
+        self.reward_sum += reward
+        self.max_reward = max(self.max_reward, reward)
+        self.last_episode = episode
 
-    for line in output.split("\n"):
-        # Match episode result lines
-        match = re.search(r"Run (\d+).*Reward: ([\d.-]+)", line)
-        if match:
-            episode = int(match.group(1))
-            reward = float(match.group(2))
-            rewards.append(reward)
-            total += 1
+        if reward >= SUCCESS_REWARD:
+            self.successes += 1
+            if self.first_success == -1:
+                self.first_success = episode
+
+        return True
+
+    @property
+    def mean_reward(self) -> float:
+        return self.reward_sum / self.total if self.total else 0.0
 
-            if reward >= 200:
-                successes += 1
-                if first_success == -1:
-                    first_success = episode
+    def as_dict(self) -> dict:
+        """Metrics in the format stored in results.jsonl."""
+        metrics = {
+            "success_rate": 0.0,
+            "mean_reward": 0.0,
+            "max_reward": -float("inf"),
+            "episodes_to_first_success": -1,
+        }
+
+        if self.total > 0:
+            metrics["success_rate"] = self.successes / self.total
+            metrics["mean_reward"] = self.mean_reward
+            metrics["max_reward"] = self.max_reward
+            metrics["episodes_to_first_success"] = self.first_success
+
+        return metrics
+
+
+def parse_training_output(output: str) -> dict:
+    """Parse training output to extract metrics."""
+    metrics = TrainingMetrics()
+    for line in output.split("\n"):
+        metrics.update(line)
+    return metrics.as_dict()
 
-    if total > 0:
-        metrics["success_rate"] = successes / total
-        metrics["mean_reward"] = sum(rewards) / len(rewards)
-        metrics["max_reward"] = max(rewards) if rewards else 0
-        metrics["episodes_to_first_success"] = first_success
 
-    return metrics
+def write_results(results: list[dict], output_dir: Path):
+    """Write a complete results.jsonl in one go, replacing any existing file atomically."""
+    tmp_path = output_dir / f".{RESULTS_FILE}.{socket.gethostname()}-{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        for result in results:
+            f.write(json.dumps(result) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, output_dir / RESULTS_FILE)
 
 
 def save_summary(results: list[dict], output_dir: Path):
@@ -158,6 +374,7 @@ def save_summary(results: list[dict], output_dir: Path):
         return
 
     # Flatten results for CSV
+    stopped_runs = any(r.get("stopped_early") for r in results)
     rows = []
     for r in results:
         row = {"run_id": r["run_id"], "success": r.get("success", False)}
@@ -166,10 +383,14 @@ def save_summary(results: list[dict], output_dir: Path):
         row["mean_reward"] = r.get("mean_reward", 0)
         row["max_reward"] = r.get("max_reward", 0)
         row["episodes_to_first_success"] = r.get("episodes_to_first_success", -1)
+        if stopped_runs:
+            row["episodes_trained"] = r.get("episodes_trained", "")
+        for column in RESOURCE_COLUMNS:
+            row[column] = r.get(column, "")
         rows.append(row)
 
-    # Sort by success rate
-    rows.sort(key=lambda x: x["success_rate"], reverse=True)
+    # Sort by success rate, ranking runs stopped early by ASHA below full runs
+    rows.sort(key=lambda x: (not x.get("episodes_trained"), x["success_rate"]), reverse=True)
 
     # Write CSV
     csv_path = output_dir / "summary.csv"
@@ -185,61 +406,818 @@ def save_summary(results: list[dict], output_dir: Path):
         best = rows[0]
         print(f"\nBest configuration (success rate: {best['success_rate']:.1%}):")
         for k, v in best.items():
-            if k not in ["run_id", "success", "success_rate", "mean_reward", "max_reward", "episodes_to_first_success"]:
+            if k not in ["run_id", "success", "success_rate", "mean_reward", "max_reward",
+                         "episodes_to_first_success", "episodes_trained", *RESOURCE_COLUMNS]:
                 print(f"  {k}: {v}")
 
 
+class AshaScheduler:
+    """Asynchronous successive halving over streamed training rewards.
+
+    Rungs sit at ``min_episodes * reduction_factor**k`` episodes. When a run
+    reaches a rung, its mean reward so far is compared with every run that
+    has reached the same rung; runs outside the top ``1/reduction_factor``
+    are stopped, the rest are promoted and keep training. The training
+    script cannot pause and resume, so this is the stopping variant of ASHA.
+    """
+
+    def __init__(self, episodes: int, min_episodes: int, reduction_factor: int = 3):
+        self.rungs = []
+        rung = min_episodes
+        while rung < episodes:
+            self.rungs.append(rung)
+            rung *= reduction_factor
+        self.reduction_factor = reduction_factor
+        self.rung_scores = {rung: {} for rung in self.rungs}
+        self.next_rung = {}
+        self.lock = threading.Lock()
+
+    def report(self, run_id: int, metrics: TrainingMetrics) -> bool:
+        """Record live metrics for a run; return True if it should stop."""
+        index = self.next_rung.get(run_id, 0)
+        if index >= len(self.rungs) or metrics.total < self.rungs[index]:
+            return False
+
+        rung = self.rungs[index]
+        self.next_rung[run_id] = index + 1
+
+        with self.lock:
+            scores = self.rung_scores[rung]
+            scores[run_id] = metrics.mean_reward
+            n_promoted = len(scores) // self.reduction_factor
+            if len(scores) < self.reduction_factor:
+                return False
+            ranked = sorted(scores.values(), reverse=True)
+            stop = metrics.mean_reward < ranked[n_promoted - 1]
+
+        if stop:
+            print(f"ASHA: stopping run {run_id} at rung {rung} "
+                  f"(mean reward {metrics.mean_reward:.1f})")
+        return stop
+
+    def scores_for(self, run_id: int) -> dict:
+        """Rung scores recorded for a run, keyed by rung episode count."""
+        return {rung: scores[run_id]
+                for rung, scores in self.rung_scores.items() if run_id in scores}
+
+    def restore(self, run_id: int, rung_scores: dict):
+        """Re-register rung scores of a run completed in an earlier session."""
+        for rung, score in rung_scores.items():
+            if int(rung) in self.rung_scores:
+                self.rung_scores[int(rung)][run_id] = score
+
+
+class TpeSampler:
+    """Tree-structured Parzen Estimator proposing points from finished runs.
+
+    Finished runs are split into a "good" set (top ``gamma`` by success rate,
+    then mean reward) and a "bad" set. Each parameter gets a Parzen density
+    per set - a Gaussian mixture for ``{"min", "max", "log"}`` ranges and
+    smoothed frequencies for lists - and candidates drawn from the good
+    density are ranked by the ratio l(x)/g(x). Batches are proposed with a
+    "constant liar": each proposed point is added to the bad set so the next
+    proposal in the batch moves elsewhere.
+    """
+
+    def __init__(self, parameters: dict, n_startup: int = 10, gamma: float = 0.25,
+                 n_candidates: int = 24, seed: int | None = None):
+        self.parameters = parameters
+        self.n_startup = n_startup
+        self.gamma = gamma
+        self.n_candidates = n_candidates
+        self.rng = random.Random(seed)
+
+    def propose(self, history: list[dict], n: int) -> list[dict]:
+        """Propose ``n`` new parameter combinations given finished results."""
+        if len(history) < self.n_startup:
+            return generate_random_combinations(self.parameters, n,
+                                                seed=self.rng.randrange(2**32))
+
+        ranked = sorted(history, reverse=True,
+                        key=lambda r: (r.get("success_rate", 0), r.get("mean_reward", 0)))
+        n_good = max(1, int(self.gamma * len(ranked)))
+        good = [r["params"] for r in ranked[:n_good]]
+        bad = [r["params"] for r in ranked[n_good:]]
+
+        seen = {combination_hash(r["params"]) for r in history}
+        proposals = []
+        for _ in range(n):
+            candidates = [self._sample_good(good) for _ in range(self.n_candidates)]
+            # Prefer points that haven't been evaluated yet
+            fresh = [c for c in candidates if combination_hash(c) not in seen]
+            best = max(fresh or candidates, key=lambda c: self._score(c, good, bad))
+            proposals.append(best)
+            seen.add(combination_hash(best))
+            bad.append(best)
+
+        return proposals
+
+    def _sample_good(self, good: list[dict]) -> dict:
+        """Draw one candidate from the good densities."""
+        combo = {}
+        for key, spec in self.parameters.items():
+            if isinstance(spec, list):
+                weights = self._categorical_weights(spec, [p[key] for p in good])
+                combo[key] = self.rng.choices(spec, weights=weights)[0]
+                continue
+            if not isinstance(spec, dict):
+                combo[key] = spec
+                continue
+
+            # Pick a mixture component: one good point or the wide prior
+            lo, hi, to_space, from_space = self._range_transform(spec)
+            points = [to_space(p[key]) for p in good]
+            component = self.rng.randrange(len(points) + 1)
+            if component == len(points):
+                centre, sigma = (lo + hi) / 2, hi - lo
+            else:
+                centre, sigma = points[component], self._bandwidth(lo, hi, len(points))
+
+            # Truncate to the range by rejection; clipping would pile
+            # duplicate candidates onto the bounds
+            x = self.rng.gauss(centre, sigma)
+            for _ in range(20):
+                if lo <= x <= hi:
+                    break
+                x = self.rng.gauss(centre, sigma)
+            combo[key] = from_space(min(hi, max(lo, x)))
+
+        return combo
+
+    def _score(self, combo: dict, good: list[dict], bad: list[dict]) -> float:
+        """Log density ratio log l(x) - log g(x), summed over parameters."""
+        score = 0.0
+        for key, spec in self.parameters.items():
+            if isinstance(spec, list):
+                index = spec.index(combo[key])
+                l_weights = self._categorical_weights(spec, [p[key] for p in good])
+                g_weights = self._categorical_weights(spec, [p[key] for p in bad])
+                score += math.log(l_weights[index] / sum(l_weights))
+                score -= math.log(g_weights[index] / sum(g_weights))
+            elif isinstance(spec, dict):
+                lo, hi, to_space, _ = self._range_transform(spec)
+                x = to_space(combo[key])
+                score += math.log(self._parzen_density(x, [to_space(p[key]) for p in good], lo, hi))
+                score -= math.log(self._parzen_density(x, [to_space(p[key]) for p in bad], lo, hi))
+        return score
+
+    @staticmethod
+    def _categorical_weights(choices: list, observed: list) -> list[float]:
+        """Observation counts per choice with a +1 prior."""
+        return [1 + sum(1 for v in observed if v == choice) for choice in choices]
+
+    @staticmethod
+    def _range_transform(spec: dict):
+        """Bounds and transforms into the space the density is fitted in."""
+        if spec.get("log", False):
+            return math.log(spec["min"]), math.log(spec["max"]), math.log, math.exp
+        return spec["min"], spec["max"], float, float
+
+    @staticmethod
+    def _bandwidth(lo: float, hi: float, n_points: int) -> float:
+        return (hi - lo) / math.sqrt(n_points + 1)
+
+    def _parzen_density(self, x: float, points: list[float], lo: float, hi: float) -> float:
+        """Gaussian mixture over observed points plus a wide prior component."""
+        sigma = self._bandwidth(lo, hi, len(points))
+        prior_sigma = hi - lo
+        density = math.exp(-0.5 * ((x - (lo + hi) / 2) / prior_sigma) ** 2) / prior_sigma
+        for point in points:
+            density += math.exp(-0.5 * ((x - point) / sigma) ** 2) / sigma
+        return density / (len(points) + 1) + 1e-12
+
+
+def combination_hash(params: dict) -> str:
+    """Stable hash identifying a parameter combination."""
+    canonical = json.dumps(params, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()[:16]
+
+
+def append_jsonl(path: Path, record: dict):
+    """Durably append one JSON record as a line.
+
+    Each record is a single write followed by fsync, so a crash can at worst
+    leave a truncated final line, which readers skip. A new record after such
+    a line starts on a fresh line so it isn't lost too.
+    """
+    with open(path, "ab") as f:
+        line = json.dumps(record).encode() + b"\n"
+        if f.tell() > 0:
+            with open(path, "rb") as existing:
+                existing.seek(-1, os.SEEK_END)
+                if existing.read(1) != b"\n":
+                    line = b"\n" + line
+        f.write(line)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def append_ledger(output_dir: Path, result: dict):
+    """Append a finished run to the sweep's append-only ledger."""
+    append_jsonl(output_dir / LEDGER_FILE, {
+        "hash": combination_hash(result.get("params", {})),
+        "run_id": result["run_id"],
+        "status": "completed" if result.get("success", False) else "failed",
+        "result": result,
+    })
+
+
+def load_ledger(output_dir: Path) -> dict[int, dict]:
+    """Load the latest ledger entry for each run id.
+
+    Entries are keyed by run rather than by combination hash: random and
+    bayes sweeps can draw the same combination for several runs. A
+    truncated final line (from a crash mid-append) is ignored.
+    """
+    entries = {}
+    ledger_path = output_dir / LEDGER_FILE
+    if not ledger_path.exists():
+        return entries
+
+    with open(ledger_path) as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            entries[entry["run_id"]] = entry
+
+    return entries
+
+
+def training_code_version() -> str | None:
+    """Hash of the training package sources, or None if they can't be found."""
+    package_dir = Path.cwd() / TRAINING_MODULE.split(".")[0]
+    sources = sorted(package_dir.rglob("*.py")) if package_dir.is_dir() else []
+    if not sources:
+        return None
+
+    digest = hashlib.sha256()
+    for path in sources:
+        digest.update(str(path.relative_to(package_dir)).encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+class ResultCache:
+    """Content-addressed store of finished runs shared across sweeps.
+
+    Entries are keyed on the canonical hash of the parameters, the episode
+    count and the training code version, and hold the run's result plus its
+    stdout/stderr logs. Hits refresh the entry's mtime; once the cache grows
+    past ``max_bytes`` the least recently used entries are evicted.
+    """
+
+    LOG_FILES = ["stdout.txt", "stderr.txt"]
+
+    def __init__(self, cache_dir: Path, code_version: str, max_bytes: int):
+        self.cache_dir = cache_dir
+        self.code_version = code_version
+        self.max_bytes = max_bytes
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def key(self, params: dict, episodes: int) -> str:
+        canonical = json.dumps(
+            {"params": params, "episodes": episodes, "code": self.code_version},
+            sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    def get(self, params: dict, episodes: int, run_id: int, output_dir: Path) -> dict | None:
+        """Return the cached result for a run, copying its logs into the run dir."""
+        entry = self.cache_dir / self.key(params, episodes)
+        try:
+            with open(entry / "result.json") as f:
+                result = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+        run_dir = output_dir / f"run_{run_id:03d}"
+        run_dir.mkdir(exist_ok=True)
+        with open(run_dir / "config.json", "w") as f:
+            json.dump(params, f, indent=2)
+        try:
+            for name in self.LOG_FILES:
+                if (entry / name).exists():
+                    shutil.copyfile(entry / name, run_dir / name)
+            os.utime(entry)
+        except OSError:
+            # Evicted by another sweep mid-copy: run it again instead
+            return None
+
+        result.update({"params": params, "run_id": run_id, "cached": True})
+        return result
+
+    def put(self, result: dict, episodes: int, output_dir: Path):
+        """Store a finished run, then evict old entries if over the size limit."""
+        entry = self.cache_dir / self.key(result["params"], episodes)
+        run_dir = output_dir / f"run_{result['run_id']:03d}"
+
+        # Build the entry in a temporary dir and rename it into place so
+        # concurrent sweeps never see a half-written entry
+        tmp = self.cache_dir / f".tmp-{entry.name}-{os.getpid()}-{threading.get_ident()}"
+        tmp.mkdir()
+        with open(tmp / "result.json", "w") as f:
+            json.dump(result, f)
+        for name in self.LOG_FILES:
+            if (run_dir / name).exists():
+                shutil.copyfile(run_dir / name, tmp / name)
+        try:
+            os.rename(tmp, entry)
+        except OSError:
+            # Another sweep stored the same run first
+            shutil.rmtree(tmp, ignore_errors=True)
+
+        self.evict()
+
+    def evict(self):
+        """Delete least recently used entries until under the size limit."""
+        entries = []
+        total = 0
+        for entry in self.cache_dir.iterdir():
+            if entry.name.startswith(".tmp-"):
+                continue
+            try:
+                if not entry.is_dir():
+                    continue
+                size = sum(f.stat().st_size for f in entry.iterdir())
+                mtime = entry.stat().st_mtime
+            except OSError:
+                # Evicted by a concurrent sweep while we were scanning
+                continue
+            entries.append((mtime, size, entry))
+            total += size
+
+        for _, size, entry in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+
+
+def run_jobs(jobs, episodes: int, output_dir: Path,
+             workers: int, on_result, scheduler: AshaScheduler | None = None,
+             cache: ResultCache | None = None):
+    """Run an iterable of (run_id, params) jobs, calling ``on_result`` as each finishes.
+
+    If a ``scheduler`` is given, it receives every run's live metrics and
+    may stop runs early. If a ``cache`` is given, cached runs are reused
+    instantly and newly finished full-length runs are stored in it.
+
+    With more than one worker, runs go to a bounded pool of concurrent
+    trainings. Each training is already its own process, so a thread per
+    slot is enough to keep ``workers`` children busy. Every slot owns one
+    CPU, which is handed to the run it executes.
+    """
+    def monitor(run_id: int):
+        if scheduler is None:
+            return None
+        return lambda metrics: scheduler.report(run_id, metrics)
+
+    def finish(result: dict):
+        # Record the run first: caching is best-effort and must never lose it
+        on_result(result)
+        if cache is not None and result.get("success") and not result.get("stopped_early"):
+            try:
+                cache.put(result, episodes, output_dir)
+            except OSError as e:
+                print(f"Warning: could not cache run {result['run_id']}: {e}")
+
+    def skip_cached(jobs):
+        for run_id, params in jobs:
+            result = cache.get(params, episodes, run_id, output_dir)
+            if result is None:
+                yield run_id, params
+            else:
+                print(f"Run {run_id}: cache hit for {params}")
+                on_result(result)
+
+    if cache is not None:
+        jobs = skip_cached(jobs)
+
+    if workers <= 1:
+        for run_id, params in jobs:
+            finish(run_training(params, episodes, run_id, output_dir,
+                                on_episode=monitor(run_id)))
+        return
+
+    cpus = available_cpus()
+    free_slots = queue.Queue()
+    for slot in range(workers):
+        free_slots.put(slot)
+
+    def run_in_slot(params: dict, run_id: int) -> dict:
+        slot = free_slots.get()
+        try:
+            return run_training(params, episodes, run_id, output_dir,
+                                cpu=cpus[slot % len(cpus)],
+                                on_episode=monitor(run_id))
+        finally:
+            free_slots.put(slot)
+
+    # Keep at most ``workers`` runs in flight so a lazy job stream is never
+    # materialised
+    jobs = iter(jobs)
+    running = set()
+    done = 0
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        while True:
+            for run_id, params in itertools.islice(jobs, workers - len(running)):
+                running.add(pool.submit(run_in_slot, params, run_id))
+            if not running:
+                break
+
+            finished, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                finish(future.result())
+                done += 1
+                print(f"Completed {done} runs")
+
+
+class WorkQueue:
+    """Shared-directory work queue letting several sweep_runner processes
+    (on one host or across an NFS mount) split one sweep.
+
+    A combination is claimed by exclusively creating ``claims/<run_id>.claim``
+    and finished by atomically renaming its result into ``done/<run_id>.json``.
+    Claim holders touch their claim files every ``heartbeat`` seconds; a claim
+    not touched for ``stale_after`` seconds belongs to a dead worker and is
+    taken over by renaming it away. Only one worker's rename can succeed, and
+    the winner checks that the file it moved is the claim it found stale
+    (same inode, mtime and holder), putting it back otherwise, so a fresh
+    claim made or touched in the meantime survives. A third worker claiming
+    the run in the instant before it is put back can still duplicate it.
+    Hosts need roughly synchronised clocks (NTP) for staleness checks to be
+    meaningful.
+    """
+
+    def __init__(self, queue_dir: Path, stale_after: float = 300, heartbeat: float = 30):
+        self.claims_dir = queue_dir / "claims"
+        self.done_dir = queue_dir / "done"
+        self.claims_dir.mkdir(parents=True, exist_ok=True)
+        self.done_dir.mkdir(parents=True, exist_ok=True)
+        self.stale_after = stale_after
+        self.heartbeat = heartbeat
+        self.worker_id = f"{socket.gethostname()}-{os.getpid()}"
+        self.held = set()
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+
+    def _claim_path(self, run_id: int) -> Path:
+        return self.claims_dir / f"{run_id:06d}.claim"
+
+    def _done_path(self, run_id: int) -> Path:
+        return self.done_dir / f"{run_id:06d}.json"
+
+    def is_done(self, run_id: int) -> bool:
+        return self._done_path(run_id).exists()
+
+    def claim(self, run_id: int) -> bool:
+        """Try to claim a run; returns False if it's done or held by a live worker."""
+        if self.is_done(run_id):
+            return False
+
+        claim_path = self._claim_path(run_id)
+        try:
+            fd = os.open(claim_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            if not self._reclaim_stale(claim_path):
+                return False
+            try:
+                fd = os.open(claim_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                return False
+
+        with os.fdopen(fd, "w") as f:
+            f.write(self.worker_id)
+
+        # The run may have finished between the done check and the claim
+        if self.is_done(run_id):
+            claim_path.unlink(missing_ok=True)
+            return False
+
+        with self.lock:
+            self.held.add(run_id)
+        return True
+
+    def _reclaim_stale(self, claim_path: Path) -> bool:
+        """Remove a claim whose holder stopped heartbeating; True if we removed it."""
+        try:
+            found = claim_path.stat()
+            holder = claim_path.read_text()
+        except FileNotFoundError:
+            return True
+        age = time.time() - found.st_mtime
+        if age < self.stale_after:
+            return False
+
+        stale_path = claim_path.with_name(f"{claim_path.name}.stale-{self.worker_id}")
+        try:
+            os.rename(claim_path, stale_path)
+        except FileNotFoundError:
+            # Another worker reclaimed it first
+            return False
+
+        # The claim may have been replaced or heartbeated since it was found
+        # stale; if so, it belongs to a live worker and goes back
+        moved = stale_path.stat()
+        if ((moved.st_ino, moved.st_mtime_ns) != (found.st_ino, found.st_mtime_ns)
+                or stale_path.read_text() != holder):
+            try:
+                os.link(stale_path, claim_path)
+            except FileExistsError:
+                pass
+            stale_path.unlink(missing_ok=True)
+            return False
+        print(f"Reclaiming stale claim {claim_path.name} ({age:.0f}s since heartbeat)")
+        stale_path.unlink(missing_ok=True)
+        return True
+
+    def complete(self, result: dict):
+        """Publish a finished run and release its claim."""
+        run_id = result["run_id"]
+        tmp_path = self.done_dir / f".{run_id:06d}.{self.worker_id}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(result, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.rename(tmp_path, self._done_path(run_id))
+
+        with self.lock:
+            self.held.discard(run_id)
+        self._claim_path(run_id).unlink(missing_ok=True)
+
+    def claimed_jobs(self, combinations, indices):
+        """Yield (run_id, params) for every combination this worker manages to claim."""
+        for i in indices:
+            if self.claim(i + 1):
+                yield i + 1, combinations[i]
+
+    def remaining(self, indices) -> int:
+        return sum(1 for i in indices if not self.is_done(i + 1))
+
+    def results(self) -> list[dict]:
+        results = []
+        for path in sorted(self.done_dir.glob("*.json")):
+            with open(path) as f:
+                results.append(json.load(f))
+        return results
+
+    def _heartbeat_loop(self):
+        while not self.stopped.wait(self.heartbeat):
+            with self.lock:
+                held = list(self.held)
+            for run_id in held:
+                try:
+                    os.utime(self._claim_path(run_id))
+                except FileNotFoundError:
+                    pass
+
+    def __enter__(self):
+        threading.Thread(target=self._heartbeat_loop, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stopped.set()
+
+
+def init_queue_dir(queue_dir: Path, config: dict | None) -> dict:
+    """Publish the sweep config to a shared queue dir (first worker wins) and
+    return the config every worker must use."""
+    queue_dir.mkdir(parents=True, exist_ok=True)
+    config_path = queue_dir / "sweep_config.json"
+    if config is not None and not config_path.exists():
+        tmp_path = queue_dir / f".sweep_config.{socket.gethostname()}-{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(config, f, indent=2)
+        try:
+            # link() fails if another worker published first
+            os.link(tmp_path, config_path)
+        except FileExistsError:
+            pass
+        finally:
+            tmp_path.unlink()
+    return load_config(config_path)
+
+
+def run_queue(work_queue: WorkQueue, combinations, indices, episodes: int, output_dir: Path,
+              workers: int, scheduler: AshaScheduler | None, cache: ResultCache | None,
+              poll_interval: float) -> list[dict]:
+    """Claim and run combinations until every one in the queue is done."""
+    with work_queue:
+        while True:
+            run_jobs(work_queue.claimed_jobs(combinations, indices), episodes, output_dir,
+                     workers, work_queue.complete, scheduler, cache)
+            remaining = work_queue.remaining(indices)
+            if remaining == 0:
+                break
+            print(f"Waiting on {remaining} runs claimed by other workers...")
+            time.sleep(poll_interval)
+
+    return work_queue.results()
+
+
+def run_bayes(config: dict, results: list[dict], next_run_id: int, episodes: int,
+              output_dir: Path, workers: int, on_result, cache: ResultCache | None = None):
+    """Run the adaptive part of a sweep, proposing each batch from finished runs.
+
+    ``results`` holds completed runs (including the random startup points and
+    any from a resumed session) and is extended by ``on_result``. Batches
+    default to one point per worker.
+    """
+    sampler = TpeSampler(
+        config["parameters"],
+        n_startup=config.get("n_startup", 10),
+        gamma=config.get("gamma", 0.25),
+        seed=config["seed"],
+    )
+    remaining = config.get("n_samples", 10) - len(results)
+    batch_size = config.get("batch_size", max(1, workers))
+
+    while remaining > 0:
+        history = [r for r in results if r.get("success", False)]
+        batch = sampler.propose(history, min(batch_size, remaining))
+        jobs = [(next_run_id + i, combo) for i, combo in enumerate(batch)]
+        next_run_id += len(jobs)
+        remaining -= len(jobs)
+        run_jobs(jobs, episodes, output_dir, workers, on_result, cache=cache)
+
+
 def main():
     parser = argparse.ArgumentParser(description="Run hyperparameter sweep")
-    parser.add_argument("config", help="Path to sweep config JSON")
+    parser.add_argument("config", nargs="?", help="Path to sweep config JSON")
     parser.add_argument("--dry-run", action="store_true", help="Show combinations without running")
     parser.add_argument("--output-dir", default="sweep_results", help="Output directory")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Number of trainings to run concurrently")
+    parser.add_argument("--resume", metavar="DIR",
+                        help="Resume an existing sweep directory, skipping completed runs")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Always retrain instead of reusing cached results")
+    parser.add_argument("--cache-dir", default=str(DEFAULT_CACHE_DIR),
+                        help="Directory of the shared result cache")
+    parser.add_argument("--cache-max-mb", type=int, default=1024,
+                        help="Evict least recently used cache entries beyond this size")
+    parser.add_argument("--shard", type=parse_shard, metavar="K/N",
+                        help="Only run every N-th combination starting at the K-th")
+    parser.add_argument("--queue", metavar="DIR",
+                        help="Shared sweep directory; workers started with the same DIR "
+                             "claim combinations from it until all are done")
+    parser.add_argument("--stale-after", type=float, default=300,
+                        help="Seconds without a heartbeat before a queue claim is reclaimed")
     args = parser.parse_args()
 
-    config = load_config(args.config)
+    if args.queue:
+        if not args.config and not (Path(args.queue) / "sweep_config.json").exists():
+            parser.error("the first --queue worker needs a config file")
+        config = load_config(args.config) if args.config else None
+        if config is not None and config.get("type") != "grid":
+            config.setdefault("seed", random.randrange(2**32))
+        # Every worker uses the published config, so random sweeps share a seed
+        config = init_queue_dir(Path(args.queue), config)
+        if config.get("type") == "bayes":
+            print("Error: bayes sweeps propose points sequentially and can't use --queue")
+            return 1
+    elif args.resume:
+        output_dir = Path(args.resume)
+        if not (output_dir / "sweep_config.json").exists():
+            print(f"Error: No sweep_config.json in {output_dir}")
+            return 1
+        config = load_config(output_dir / "sweep_config.json")
+    elif args.config:
+        config = load_config(args.config)
+    else:
+        parser.error("a config file or --resume DIR is required")
 
-    # Generate combinations
+    # Random sweeps need a fixed seed so a resumed sweep regenerates
+    # the same combinations. Shards run on separate machines must all draw
+    # the same ones too, so without a configured seed theirs is derived
+    # from the config itself.
     sweep_type = config.get("type", "grid")
+    if sweep_type != "grid" and "seed" not in config:
+        if args.shard is not None:
+            config["seed"] = int(combination_hash(config), 16) % 2**32
+            print(f"No seed in config: using {config['seed']} (derived from the config) for every shard")
+        else:
+            config["seed"] = random.randrange(2**32)
+    if sweep_type == "bayes" and (args.shard is not None or config.get("shard")):
+        print("Error: bayes sweeps propose points sequentially and can't use --shard")
+        return 1
+
+    # Generate combinations
     if sweep_type == "grid":
         combinations = generate_grid_combinations(config["parameters"])
+    elif sweep_type == "bayes":
+        # Only the random startup points are known up front
+        n_startup = min(config.get("n_startup", 10), config.get("n_samples", 10))
+        combinations = generate_random_combinations(config["parameters"], n_startup,
+                                                    seed=config["seed"])
     else:
         n_samples = config.get("n_samples", 10)
-        combinations = generate_random_combinations(config["parameters"], n_samples)
+        combinations = generate_random_combinations(config["parameters"], n_samples,
+                                                    seed=config["seed"])
+
+    # A resumed sweep keeps the shard it was started with
+    if args.shard is None and config.get("shard"):
+        args.shard = parse_shard(config["shard"])
+    elif args.shard is not None:
+        config["shard"] = "/".join(map(str, args.shard))
+    indices = shard_indices(len(combinations), args.shard)
 
     print(f"Sweep: {config.get('name', 'unnamed')}")
     print(f"Type: {sweep_type}")
-    print(f"Total configurations: {len(combinations)}")
+    if sweep_type == "bayes":
+        print(f"Total configurations: {config.get('n_samples', 10)} "
+              f"({len(combinations)} random startup, rest proposed adaptively)")
+    else:
+        print(f"Total configurations: {len(combinations)}")
+    if args.shard is not None:
+        print(f"Shard {config['shard']}: {len(indices)} configurations")
 
     if args.dry_run:
         print("\nConfigurations:")
-        for i, combo in enumerate(combinations):
-            print(f"  {i+1}: {combo}")
-        return
+        for i in indices:
+            print(f"  {i+1}: {combinations[i]}")
+        return 0
 
-    # Create output directory
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    output_dir = Path(args.output_dir) / f"{config.get('name', 'sweep')}_{timestamp}"
-    output_dir.mkdir(parents=True, exist_ok=True)
+    episodes = config.get("episodes_per_run", 500)
+    scheduler = None
+    if sweep_type == "asha":
+        asha = config.get("asha", {})
+        scheduler = AshaScheduler(
+            episodes,
+            asha.get("min_episodes", max(1, episodes // 10)),
+            asha.get("reduction_factor", 3),
+        )
+        print(f"ASHA rungs (episodes): {scheduler.rungs}")
 
-    # Save sweep config
-    with open(output_dir / "sweep_config.json", "w") as f:
-        json.dump(config, f, indent=2)
+    cache = None
+    if not args.no_cache:
+        code_version = training_code_version()
+        if code_version is None:
+            print("Result cache disabled: training sources not found")
+        else:
+            cache = ResultCache(Path(args.cache_dir), code_version,
+                                args.cache_max_mb * 1024 * 1024)
 
-    # Run sweep
-    episodes = config.get("episodes_per_run", 500)
-    results = []
+    if args.queue:
+        # Claims and done files replace the ledger; ASHA rungs are
+        # compared among this worker's runs only
+        output_dir = Path(args.queue)
+        work_queue = WorkQueue(output_dir, stale_after=args.stale_after,
+                               heartbeat=min(30, args.stale_after / 4))
+        results = run_queue(work_queue, combinations, indices, episodes, output_dir,
+                            args.workers, scheduler, cache, poll_interval=min(30, args.stale_after / 4))
+        write_results(results, output_dir)
+        save_summary(results, output_dir)
+        return 0
+
+    if not args.resume:
+        # Create output directory
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output_dir = Path(args.output_dir) / f"{config.get('name', 'sweep')}_{timestamp}"
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        # Save sweep config
+        with open(output_dir / "sweep_config.json", "w") as f:
+            json.dump(config, f, indent=2)
 
-    for i, combo in enumerate(combinations):
-        result = run_training(combo, episodes, i + 1, output_dir)
+    # Skip runs the ledger already records as completed. For bayes
+    # sweeps this also counts adaptive runs from an earlier session.
+    ledger = load_ledger(output_dir)
+    completed = {run_id for run_id, e in ledger.items() if e["status"] == "completed"}
+    results = [ledger[run_id]["result"] for run_id in sorted(completed)]
+
+    def pending_jobs():
+        for i in indices:
+            if i + 1 not in completed:
+                yield i + 1, combinations[i]
+
+    if args.resume:
+        print(f"Resuming: {len(results)} runs already completed")
+
+    if scheduler is not None:
+        for r in results:
+            scheduler.restore(r["run_id"], r.get("rung_scores", {}))
+
+    def record_result(result: dict):
+        if scheduler is not None:
+            result["rung_scores"] = scheduler.scores_for(result["run_id"])
+        append_ledger(output_dir, result)
+        append_jsonl(output_dir / RESULTS_FILE, result)
         results.append(result)
 
-        # Save intermediate results
-        with open(output_dir / "results.json", "w") as f:
-            json.dump(results, f, indent=2)
+    # Run sweep
+    run_jobs(pending_jobs(), episodes, output_dir, args.workers, record_result, scheduler, cache)
+    if sweep_type == "bayes":
+        next_run_id = max([len(combinations), *ledger]) + 1
+        run_bayes(config, results, next_run_id, episodes, output_dir, args.workers,
+                  record_result, cache)
 
     # Save summary
+    results.sort(key=lambda r: r["run_id"])
     save_summary(results, output_dir)
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    exit(main())